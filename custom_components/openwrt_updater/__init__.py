@@ -3,12 +3,26 @@
 import asyncio
 from datetime import timedelta
 import logging
+import time
 
 from homeassistant.config_entries import ConfigEntry, ConfigEntryNotReady
-from homeassistant.core import HomeAssistant
-
-from .coordinators import LocalTohCacheCoordinator, OpenWRTDeviceCoordinator
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .coordinators import (
+    LocalTohCacheCoordinator,
+    OpenWRTDeviceCoordinator,
+    OpenWRTPlaceCoordinator,
+)
 from .helpers.const import DOMAIN, INTEGRATION_DEFAULTS
+from .helpers.inventory import PackageInventory
+from .helpers.liveness import LivenessScanner
+from .helpers.push_agent import async_ensure_webhook_id, async_register_webhook
+from .helpers.schedule import JITTER_FRACTION
+from .helpers.snapshot_store import SnapshotStore
+from .helpers.summary import FleetSummary
+from .helpers.ssh_client import SSHConnectionPool
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,10 +30,16 @@ PLATFORMS = [
     "binary_sensor",
     "button",
     # "select",
+    "sensor",
     "switch",
     "text",
     "update",
 ]
+# The global entry only carries the fleet summary sensors
+GLOBAL_PLATFORMS = ["sensor"]
+
+# Longest wait for first device refreshes during setup of a place
+SETUP_DEADLINE_SECONDS = 30.0
 
 
 def _build_global_config(hass: HomeAssistant, entry: ConfigEntry) -> dict:
@@ -61,6 +81,23 @@ async def _async_init_global_state(hass: HomeAssistant, entry: ConfigEntry) -> N
     """Build global config and refresh shared TOH coordinator."""
     component_config = _build_global_config(hass, entry)
     hass.data[DOMAIN]["config"] = component_config
+    hass.data[DOMAIN]["ssh_pool"].configure_timeouts(
+        component_config["ssh_timeout_min_seconds"],
+        component_config["ssh_timeout_max_seconds"],
+    )
+    hass.data[DOMAIN]["ssh_pool"].scheduler.configure(
+        component_config["ssh_max_concurrency"]
+    )
+    # The adaptive policy may stretch polls up to the maximum interval
+    hass.data[DOMAIN]["ssh_pool"].configure_idle_timeout(
+        max(
+            component_config["device_timeout_minutes"],
+            component_config["device_max_interval_minutes"],
+            component_config["event_poll_minutes"],
+        )
+        * 60,
+        JITTER_FRACTION,
+    )
     await _async_replace_toh_coordinator(hass, component_config)
     hass.data[DOMAIN]["global_ready"].set()
     _LOGGER.debug("Global state initialized/reloaded")
@@ -73,13 +110,129 @@ async def async_setup(hass: HomeAssistant, config):
       - "config": global configuration for all Config Entries; sets up in entry setup
       - "toh_cache": cache of web TOH; sets up in entry setup
       - "global_ready": flag of global configuration
+      - "ssh_pool": shared pool of keep-alive SSH connections
+      - "liveness": shared scanner watching devices expected back online
+      - "snapshots": persisted last good snapshot per device, for a warm start
+      - "inventory": fleet index of installed packages and firmware versions
+      - "summary": fleet-wide FleetSummary over all places
     """
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN].setdefault("global_ready", asyncio.Event())
     hass.data[DOMAIN].setdefault("boards", {})
+
+    if "ssh_pool" not in hass.data[DOMAIN]:
+        ssh_pool = SSHConnectionPool()
+        hass.data[DOMAIN]["ssh_pool"] = ssh_pool
+
+        async def _async_close_pool(_event: Event) -> None:
+            """Close pooled SSH connections on shutdown."""
+            await ssh_pool.async_close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close_pool)
+
+    if "liveness" not in hass.data[DOMAIN]:
+        liveness = LivenessScanner(hass)
+        hass.data[DOMAIN]["liveness"] = liveness
+
+        async def _async_stop_liveness(_event: Event) -> None:
+            """Stop the liveness scanner on shutdown."""
+            await liveness.async_stop()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_liveness)
+
+    if "snapshots" not in hass.data[DOMAIN]:
+        snapshots = SnapshotStore(hass)
+        await snapshots.async_load()
+        hass.data[DOMAIN]["snapshots"] = snapshots
+
+    hass.data[DOMAIN].setdefault("inventory", PackageInventory())
+    hass.data[DOMAIN].setdefault("summary", FleetSummary())
+    async_setup_services(hass)
     return True
 
 
+def _track_summaries(
+    entry: ConfigEntry,
+    coordinator: OpenWRTDeviceCoordinator,
+    summaries: tuple[FleetSummary, ...],
+) -> None:
+    """Feed every published snapshot of a device into the fleet summaries."""
+
+    @callback
+    def _update() -> None:
+        """Apply the device's latest snapshot as a delta."""
+        for summary in summaries:
+            summary.update(
+                coordinator.ip, coordinator.data, coordinator.last_update_success
+            )
+
+    @callback
+    def _remove() -> None:
+        """Drop the device from the summaries on unload."""
+        for summary in summaries:
+            summary.remove(coordinator.ip)
+
+    _update()
+    entry.async_on_unload(coordinator.async_add_listener(_update))
+    entry.async_on_unload(_remove)
+
+
+async def _async_first_refresh(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinators: dict[str, OpenWRTDeviceCoordinator],
+    warm: set[str],
+    place: OpenWRTPlaceCoordinator | None,
+) -> int:
+    """Run first refreshes of a place concurrently, bounded by a deadline.
+
+    Refreshes run as entry background tasks, at most `ssh_max_concurrency`
+    devices at a time. Setup only waits for devices without a persisted
+    snapshot, and for at most SETUP_DEADLINE_SECONDS; the rest finish in the
+    background. Returns the number of refreshes still running.
+    """
+    slots = asyncio.Semaphore(hass.data[DOMAIN]["config"]["ssh_max_concurrency"])
+
+    async def _bounded(coordinator: OpenWRTDeviceCoordinator) -> None:
+        """Refresh one device within the fan-out bound."""
+        async with slots:
+            await coordinator.async_refresh()
+
+    waited: list[asyncio.Task] = []
+    for ip, coordinator in coordinators.items():
+        # The place sweep polls these, with its own bound
+        if place is not None and not coordinator.polls_itself:
+            continue
+        task = entry.async_create_background_task(
+            hass, _bounded(coordinator), f"{DOMAIN}-first-refresh-{ip}"
+        )
+        if ip not in warm:
+            waited.append(task)
+    if place is not None:
+        task = entry.async_create_background_task(
+            hass, place.async_refresh(), f"{DOMAIN}-first-sweep-{entry.entry_id}"
+        )
+        if any(
+            ip not in warm
+            for ip, coordinator in coordinators.items()
+            if not coordinator.polls_itself
+        ):
+            waited.append(task)
+
+    if not waited:
+        return 0
+    _done, pending = await asyncio.wait(waited, timeout=SETUP_DEADLINE_SECONDS)
+    if pending:
+        _LOGGER.warning(
+            "%d first refreshes of %s missed the %.0fs setup deadline, "
+            "finishing in background",
+            len(pending),
+            entry.data.get("place_name"),
+            SETUP_DEADLINE_SECONDS,
+        )
+    return len(pending)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up a config entry and its shared/device coordinators.
 
@@ -88,8 +241,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         - "place_ipmask": IP mask for ConfigEntry
         - "place_name": Name of the place for ConfigEntry
       - dict[ip, OpenWRTDeviceCoordinator]
+      - "place_coordinator": OpenWRTPlaceCoordinator in batched polling mode
+      - "summary": FleetSummary of the place
     """
 
+    if entry.unique_id != "__global__":
+        async_ensure_webhook_id(hass, entry)
     entry.async_on_unload(entry.add_update_listener(_on_entry_update))
 
     hass.data.setdefault(DOMAIN, {})
@@ -98,6 +255,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if entry.unique_id == "__global__":
         await _async_init_global_state(hass, entry)
+        await hass.config_entries.async_forward_entry_setups(entry, GLOBAL_PLATFORMS)
     else:
         if not hass.data[DOMAIN]["global_ready"].is_set():
             raise ConfigEntryNotReady("Waiting for __global__ entry")
@@ -107,21 +265,58 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Get devices info from config_entry
         devices = entry.options.get("devices", {})
 
+        # Poll the whole place in one sweep instead of a timer per device
+        batched = hass.data[DOMAIN]["config"]["place_batch_polling"]
+        coordinators: dict[str, OpenWRTDeviceCoordinator] = {}
+        # Devices served from their persisted snapshot, refreshed in background
+        warm: set[str] = set()
+        started = time.monotonic()
+
         # Save config-entry and coordinator data to hass.data for each device
         for ip, device in devices.items():
             # Config-entry data
             hass.data[DOMAIN][entry.entry_id][ip] = dict(device)
             # Coordinator data
-            coordinator = OpenWRTDeviceCoordinator(hass, entry, ip)
-            await coordinator.async_config_entry_first_refresh()
+            coordinator = OpenWRTDeviceCoordinator(hass, entry, ip, batched=batched)
+            if coordinator.async_restore_snapshot():
+                warm.add(ip)
             hass.data[DOMAIN][entry.entry_id][ip]["coordinator"] = coordinator
+            coordinators[ip] = coordinator
 
             _LOGGER.debug(
                 "Initial HAss data: %s", hass.data[DOMAIN][entry.entry_id][ip]
             )
 
+        summary = FleetSummary()
+        hass.data[DOMAIN][entry.entry_id]["summary"] = summary
+        for coordinator in coordinators.values():
+            _track_summaries(
+                entry, coordinator, (summary, hass.data[DOMAIN]["summary"])
+            )
+
+        place = None
+        if batched:
+            place = OpenWRTPlaceCoordinator(hass, entry, coordinators)
+            hass.data[DOMAIN][entry.entry_id]["place_coordinator"] = place
+
+        pending = await _async_first_refresh(hass, entry, coordinators, warm, place)
+        for coordinator in coordinators.values():
+            coordinator.async_start()
+        if place is not None:
+            place.async_start()
+
+        async_register_webhook(hass, entry)
+
         # Initialize all platforms
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        _LOGGER.info(
+            "Place %s set up in %.1fs: %d devices, %d from snapshot, %d still polling",
+            entry.data.get("place_name"),
+            time.monotonic() - started,
+            len(coordinators),
+            len(warm),
+            pending,
+        )
 
     return True
 
@@ -135,7 +330,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if global_ready:
             global_ready.clear()
 
-        return True
+        return await hass.config_entries.async_unload_platforms(entry, GLOBAL_PLATFORMS)
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
@@ -8,14 +8,14 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .entity import OpenWRTEntity
 from .helpers.const import DOMAIN, get_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class OpenWRTBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class OpenWRTBinarySensor(OpenWRTEntity, BinarySensorEntity):
     """Represent an OpenWRT binary sensor entity."""
 
     def __init__(
@@ -38,6 +38,7 @@ class OpenWRTBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
         # base entity properties
         self._key = key
+        self._snapshot_fields = (key,)
         self._attr_name = f"{name} ({ip})"
         self._attr_unique_id = f"{name.lower().replace(' ', '_')}_{ip}"
         self._attr_entity_category = entity_category
@@ -50,9 +51,7 @@ class OpenWRTBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         """Return the current sensor state."""
-        if self.coordinator.data is None:
-            return False
-        return self.coordinator.data.get(self._key)
+        return self._snapshot_value(self._key, False)
 
     @property
     def available(self):
@@ -107,4 +106,4 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
             ]
         )
 
-    async_add_entities(entities, update_before_add=True)
+    async_add_entities(entities)
@@ -6,16 +6,23 @@ from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .coordinators.device import OpenWRTDeviceCoordinator
+from .entity import OpenWRTEntity
 from .helpers.const import DOMAIN, get_device_info
+from .helpers.push_agent import (
+    agent_url,
+    async_install_agent,
+    async_save_push_token,
+    new_push_token,
+)
+from .helpers.scheduler import PRIORITY_USER
 from .helpers.ssh_client import OpenWRTSSH
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class OpenWRTButton(CoordinatorEntity, ButtonEntity):
+class OpenWRTButton(OpenWRTEntity, ButtonEntity):
     """Represent an OpenWRT button entity."""
 
     def __init__(
@@ -63,10 +70,37 @@ class OpenWRTButton(CoordinatorEntity, ButtonEntity):
             _LOGGER.error("Coordinator data: %s", dev["coordinator"].data)
         elif self._key == "reboot":
             _key_path = self.hass.data[DOMAIN]["config"]["ssh_key_path"]
-            async with OpenWRTSSH(self._ip, _key_path) as client:
-                result = await client.exec_command("reboot", timeout=1800)
+            async with OpenWRTSSH(
+                self._ip,
+                _key_path,
+                pool=self.hass.data[DOMAIN]["ssh_pool"],
+                jump=self.coordinator.jump,
+                priority=PRIORITY_USER,
+            ) as client:
+                result = await client.run_disruptive(
+                    "echo Rebooting; reboot", timeout=60
+                )
                 _LOGGER.warning("Reboot command ended with %s", result)
             await self.coordinator.async_wait_for_alive()
+        elif self._key == "install_agent":
+            # Every install gets a new token; the old one stops working
+            token = new_push_token()
+            url = agent_url(self.hass, self._config_entry, self._ip, token)
+            _key_path = self.hass.data[DOMAIN]["config"]["ssh_key_path"]
+            async with OpenWRTSSH(
+                self._ip,
+                _key_path,
+                pool=self.hass.data[DOMAIN]["ssh_pool"],
+                jump=self.coordinator.jump,
+                priority=PRIORITY_USER,
+            ) as client:
+                installed = await async_install_agent(client, url)
+            if installed:
+                # The URL carries the token, so it is not logged
+                _LOGGER.info("Push agent installed on %s", self._ip)
+                async_save_push_token(self.hass, self._config_entry, self._ip, token)
+            else:
+                _LOGGER.error("Push agent installation on %s failed", self._ip)
 
     def __repr__(self):
         """Return a debug string representation."""
@@ -84,7 +118,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
         coordinator = hass.data[DOMAIN][config_entry.entry_id][ip]["coordinator"]
         entities.extend(
             [
-                #OpenWRTButton(
+                # OpenWRTButton(
                 #    coordinator=coordinator,
                 #    config_entry=config_entry,
                 #    ip=ip,
@@ -92,7 +126,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
                 #    key="debug",
                 #    entity_category=EntityCategory.DIAGNOSTIC,
                 #    entity_icon="mdi:bug-play",
-                #),
+                # ),
                 OpenWRTButton(
                     coordinator=coordinator,
                     config_entry=config_entry,
@@ -104,5 +138,17 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
                 ),
             ]
         )
-
-    async_add_entities(entities, update_before_add=True)
+        if coordinator.accepts_push:
+            entities.append(
+                OpenWRTButton(
+                    coordinator=coordinator,
+                    config_entry=config_entry,
+                    ip=ip,
+                    name="Install push agent",
+                    key="install_agent",
+                    entity_category=EntityCategory.CONFIG,
+                    entity_icon="mdi:upload-network",
+                )
+            )
+
+    async_add_entities(entities)
@@ -1,9 +1,11 @@
 """Initialize coordinators."""
 
 from .device import OpenWRTDeviceCoordinator
+from .place import OpenWRTPlaceCoordinator
 from .sysupgrade import LocalTohCacheCoordinator
 
 __all__ = [
     "LocalTohCacheCoordinator",
     "OpenWRTDeviceCoordinator",
+    "OpenWRTPlaceCoordinator",
 ]
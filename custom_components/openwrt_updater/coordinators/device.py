@@ -2,18 +2,26 @@
 
 from __future__ import annotations
 
-import asyncio
 from datetime import timedelta
 import logging
 import time
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from ..helpers.const import DOMAIN, SIGNAL_BOARDS_CHANGED
-from ..helpers.helpers import async_check_alive
+from ..helpers.event_stream import DeviceEventStream
+from ..helpers.helpers import async_check_alive, get_jump_host, load_device_option
+from ..helpers.probe import build_device_probe, parse_probe_output
+from ..helpers.push_agent import PUSH_FRESHNESS_SECONDS
+from ..helpers.schedule import AdaptivePollPolicy, PhasedTimer
 from ..helpers.ssh_client import OpenWRTSSH
+from ..helpers.types import DeviceProbe, DeviceSnapshot
+from ..helpers.ubus_client import OpenWRTUbus
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -21,136 +29,458 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# Probe sections whose failure leaves the snapshot without facts worth keeping
+_PERSIST_BLOCKING_ERRORS = frozenset({"probe", "board", "packages"})
 
-class OpenWRTDeviceCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+
+class OpenWRTDeviceCoordinator(DataUpdateCoordinator[DeviceSnapshot]):
     """Poll device state over SSH and enrich it with cached TOH data.
 
     This coordinator must not perform any network calls to TOH. It reads TOH
     information via the shared TohCacheCoordinator instance stored in hass.data.
     """
 
-    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, ip: str) -> None:
-        """Initialize the device coordinator for a specific IP."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        ip: str,
+        batched: bool = False,
+    ) -> None:
+        """Initialize the device coordinator for a specific IP.
+
+        Polls run on a staggered per-IP schedule (see `schedule.py`) instead
+        of the base class timer. A `batched` coordinator has no timer of its
+        own; the place coordinator polls it through `async_sweep()`.
+        """
         super().__init__(
             hass=hass,
             logger=_LOGGER,
             name=f"{DOMAIN}-device-{ip}",
-            update_interval=timedelta(
-                minutes=hass.data[DOMAIN]["config"]["device_timeout_minutes"]
-            ),
+            update_interval=None,
+            # Snapshots compare by value: an unchanged poll notifies nobody
+            always_update=False,
+        )
+        config = hass.data[DOMAIN]["config"]
+        poll_interval = (
+            None if batched else timedelta(minutes=config["device_timeout_minutes"])
         )
         self.hass = hass
         self.entry = config_entry
         self.ip = ip
+        # (username, host) of the builder node when polling through it
+        self.jump = get_jump_host(hass, config_entry, ip)
+        # Optional `ubus listen` session; polling becomes a safety net
+        self.event_stream: DeviceEventStream | None = None
+        if load_device_option(config_entry, ip, "use_event_stream", False):
+            self.event_stream = DeviceEventStream(
+                ip,
+                config["ssh_key_path"],
+                hass.data[DOMAIN]["ssh_pool"],
+                self._on_device_event,
+                jump=self.jump,
+            )
+            poll_interval = timedelta(
+                minutes=max(
+                    config["event_poll_minutes"], config["device_timeout_minutes"]
+                )
+            )
+        self._timer = (
+            None
+            if poll_interval is None
+            else PhasedTimer(hass, ip, poll_interval, self.async_refresh)
+        )
+        base_interval = (
+            poll_interval or timedelta(minutes=config["device_timeout_minutes"])
+        ).total_seconds()
+        self._policy = AdaptivePollPolicy(
+            base=base_interval, maximum=config["device_max_interval_minutes"] * 60
+        )
+        # Monotonic time before which the place sweep skips this device
+        self._sweep_after = 0.0
+        # Optional ubus JSON-RPC transport; SSH remains the fallback
+        self._ubus: OpenWRTUbus | None = None
+        if load_device_option(config_entry, ip, "use_ubus_http", False):
+            self._ubus = OpenWRTUbus(
+                async_get_clientsession(hass),
+                ip,
+                config["ubus_username"],
+                config["ubus_password"],
+            )
+
+        # Router push agent; fresh pushes replace SSH polling
+        self.accepts_push = bool(
+            load_device_option(config_entry, ip, "use_push_agent", False)
+        )
+        self._pushed_probe: DeviceProbe | None = None
+        self._last_push = 0.0
 
         self._toh = hass.data[DOMAIN]["toh_index"]
         self._unsub_toh = self._toh.async_add_listener(self._on_toh_update)
         config_entry.async_on_unload(self._unsub_toh)
         self._pair_registered = False
-        self._fast_alive_track: asyncio.Task | None = None
+        # Last online probe; its static facts are reused until boot_id changes
+        self._last_probe: DeviceProbe | None = None
+        # Delayed refresh replacing the liveness watch for jump host devices
+        self._unsub_alive_refresh: CALLBACK_TYPE | None = None
 
-    def _on_toh_update(self) -> None:
-        """Refresh entities after TOH changes without extra SSH calls."""
+    @property
+    def polls_itself(self) -> bool:
+        """Return whether this device keeps its own schedule in batched mode."""
+        return self._timer is not None
+
+    @property
+    def next_poll(self) -> float | None:
+        """Return the Unix time of the next scheduled poll, if any."""
+        return None if self._timer is None else self._timer.next_run
+
+    async def async_sweep(self) -> bool:
+        """Poll once on behalf of the place coordinator.
+
+        Listeners are only notified when the snapshot differs from the last
+        one or the success state flips. Devices whose adaptive interval has
+        not elapsed yet are skipped. Returns whether listeners were notified.
+        """
+        if time.monotonic() < self._sweep_after:
+            return False
+        try:
+            data = await self._async_update_data()
+        except UpdateFailed as err:
+            _LOGGER.debug("Sweep of %s failed: %s", self.ip, err)
+            return self.async_set_sweep_failed(err)
+        if self.last_update_success and data == self.data:
+            return False
+        self.async_set_updated_data(data)
+        return True
+
+    def async_set_sweep_failed(self, err: Exception) -> bool:
+        """Mark the last sweep of this device as failed.
+
+        Returns whether listeners were notified, i.e. the state flipped.
+        """
+        if not self.last_update_success:
+            return False
+        self.last_update_success = False
+        self.last_exception = err
+        self.async_update_listeners()
+        return True
+
+    def async_restore_snapshot(self) -> bool:
+        """Serve the persisted snapshot of this device, marked stale.
+
+        The (target, board) pair is registered right away so the TOH index
+        can resolve it before the first poll. Returns whether a snapshot was
+        found; the caller refreshes in the background.
+        """
+        stored = self.hass.data[DOMAIN]["snapshots"].get(self.ip)
+        if not stored:
+            return False
+        _LOGGER.debug("Warm start of %s from persisted snapshot", self.ip)
+        snapshot = DeviceSnapshot.from_dict(stored)
+        self._register_pair(snapshot.target, snapshot.board_name)
+        self.hass.data[DOMAIN]["inventory"].update(
+            self.ip, snapshot.packages, snapshot.current_os_version
+        )
+        version, sysupgrade_url = self._toh.get_os_info(
+            snapshot.target, snapshot.board_name
+        )
+        self.async_set_updated_data(
+            snapshot.with_changes(
+                available_os_version=version or snapshot.available_os_version,
+                snapshot_url=sysupgrade_url or snapshot.snapshot_url,
+                stale=True,
+            )
+        )
+        return True
+
+    def async_start(self) -> None:
+        """Arm the poll timer and event stream until the entry unloads."""
+        if self._timer is not None:
+            self._timer.start()
+            self.entry.async_on_unload(self._timer.stop)
+        if self.event_stream is not None:
+            self.event_stream.start(
+                lambda coro, name: self.entry.async_create_background_task(
+                    self.hass, coro, name
+                )
+            )
+            self.entry.async_on_unload(self.event_stream.async_stop)
+        self.entry.async_on_unload(
+            lambda: self.hass.data[DOMAIN]["liveness"].unwatch(self.ip)
+        )
+        self.entry.async_on_unload(self._cancel_alive_refresh)
+        self.entry.async_on_unload(
+            lambda: self.hass.data[DOMAIN]["inventory"].remove(self.ip)
+        )
+
+    def _on_device_event(self, reason: str) -> None:
+        """Refresh after a device event; bursts are coalesced by the debouncer."""
+        _LOGGER.debug("Refresh of %s requested by %s", self.ip, reason)
         self.hass.async_create_task(self.async_request_refresh())
 
+    @property
+    def push_is_fresh(self) -> bool:
+        """Return whether the push agent reported within the freshness window."""
+        return (
+            self._pushed_probe is not None
+            and time.monotonic() - self._last_push < PUSH_FRESHNESS_SECONDS
+        )
+
+    def async_handle_push(self, text: str) -> bool:
+        """Apply a probe document pushed by the router agent.
+
+        Returns False if the document skips sections this coordinator has no
+        matching copy of, so the agent resends them in full.
+        """
+        sections = parse_probe_output(text)
+        if "boot" not in sections:
+            return False
+        probe = build_device_probe(sections, self._last_probe)
+        previous = self._last_probe
+        board = sections.get("board")
+        packages = sections.get("packages")
+        if (
+            board is not None
+            and board.skipped
+            and (
+                previous is None
+                or previous.boot_id != probe.boot_id
+                or "board" in previous.errors
+            )
+        ):
+            return False
+        if (
+            packages is not None
+            and packages.skipped
+            and (
+                previous is None
+                or previous.package_fingerprint != probe.package_fingerprint
+                or "packages" in previous.errors
+            )
+        ):
+            return False
+
+        _LOGGER.debug("Push from %s accepted", self.ip)
+        self._pushed_probe = probe
+        self._last_push = time.monotonic()
+        self.hass.async_create_task(self.async_refresh())
+        return True
+
+    @callback
+    def _on_toh_update(self) -> None:
+        """Merge a changed TOH entry into the snapshot without contacting the device.
+
+        Entities are only notified when this device's resolved version or
+        sysupgrade URL actually changed.
+        """
+        if self.data is None:
+            return
+        version, sysupgrade_url = self._toh.get_os_info(
+            self.data.target, self.data.board_name
+        )
+        if (
+            version == self.data.available_os_version
+            and sysupgrade_url == self.data.snapshot_url
+        ):
+            return
+        _LOGGER.debug("TOH entry of %s changed to %s", self.ip, version)
+        self.async_set_updated_data(
+            self.data.with_changes(
+                available_os_version=version, snapshot_url=sysupgrade_url
+            )
+        )
+
     async def async_wait_for_alive(
         self, interval: float = 5.0, max_duration: float = 180.0, timeout: float = 1.0
     ) -> None:
-        """Start fast alive wait loop if not already running.
+        """Watch the device until it answers on port 22, then refresh.
 
-        Creates background task which polls TCP port 22 until device is back
-        or timeout is reached. Does not block caller.
+        The shared LivenessScanner probes the device with backoff; repeated
+        calls while it is watched are merged. Devices behind a jump host are
+        usually not routable from Home Assistant, so they get one refresh
+        after half of `max_duration` instead. Does not block caller.
         """
-        # Do not start second fast-mode if one is already running
-        if self._fast_alive_track is not None and not self._fast_alive_track.done():
-            return
-
         if not self.ip:
             return
+        if self.jump is not None:
+            self._cancel_alive_refresh()
+            self._unsub_alive_refresh = async_call_later(
+                self.hass, max_duration / 2, self._async_alive_refresh
+            )
+            return
 
-        async def _runner() -> None:
-            """Background fast-alive loop."""
-            start = time.monotonic()
-            try:
-                while (time.monotonic() - start) < max_duration:
-                    is_alive = await async_check_alive(
-                        self.ip,
-                        22,
-                        timeout=timeout,
-                    )
-                    if is_alive:
-                        await self.async_request_refresh()
-                        return
-
-                    await asyncio.sleep(interval)
-            finally:
-                # Ensure flag is cleared when task finishes
-                self._fast_alive_track = None
-
-        # Create background task and store it
-        self._fast_alive_track = self.hass.async_create_task(
-            _runner(),
-            name=f"{self.name}-fast-alive",
+        self.hass.data[DOMAIN]["liveness"].watch(
+            self.ip,
+            self._on_alive,
+            interval=interval,
+            max_duration=max_duration,
+            timeout=timeout,
         )
 
+    def _on_alive(self) -> None:
+        """Refresh as soon as the liveness scanner sees the device again."""
+        self.hass.async_create_task(self.async_request_refresh())
+
+    async def _async_alive_refresh(self, _now) -> None:
+        """Refresh a jump host device once it had time to come back."""
+        self._unsub_alive_refresh = None
+        await self.async_request_refresh()
+
+    def _cancel_alive_refresh(self) -> None:
+        """Cancel a pending delayed refresh, if any."""
+        if self._unsub_alive_refresh is not None:
+            self._unsub_alive_refresh()
+            self._unsub_alive_refresh = None
+
+    async def _async_probe(self) -> DeviceProbe:
+        """Probe the device over ubus HTTP if enabled, falling back to SSH.
+
+        While the push agent keeps reporting, its latest document is used
+        and the device is not contacted at all.
+        """
+        if self.push_is_fresh:
+            return self._pushed_probe
+        if self._policy.breaker_open and self.jump is None:
+            # Offline for a while: a TCP probe is enough to tell it is still away
+            if not await async_check_alive(self.ip, 22, timeout=1.0):
+                return DeviceProbe()
+            _LOGGER.info("%s answers on port 22 again, resuming full polls", self.ip)
+        if self._ubus is not None:
+            probe = await self._ubus.async_get_device_info(previous=self._last_probe)
+            if probe.online:
+                return probe
+            _LOGGER.debug("ubus probe of %s failed, falling back to SSH", self.ip)
+
+        key_path = self.hass.data[DOMAIN]["config"]["ssh_key_path"]
+        client = OpenWRTSSH(
+            self.ip, key_path, pool=self.hass.data[DOMAIN]["ssh_pool"], jump=self.jump
+        )
+        return await client.async_get_device_info(previous=self._last_probe)
+
     async def _async_update_data(self):
         """Fetch device state and compose a DeviceData snapshot.
 
-        - Live device state is fetched via `get_dev_state()`.
+        - Live device state is fetched via `async_get_device_info()`.
         - TOH info is resolved from the shared TohCacheCoordinator (no network).
         """
         _LOGGER.debug("Update coordinator for %s", self.ip)
 
-        # 1) Fetch live device state
-        key_path = self.hass.data[DOMAIN]["config"]["ssh_key_path"]
-        client = OpenWRTSSH(self.ip, key_path)
-
+        # 1) Fetch live device state (static facts cached per boot)
         try:
-            (
-                os_version,
-                status,
-                fw_downloaded,
-                fw_file,
-                hostname,
-                distribution,
-                target,
-                board_name,
-                pkgs,
-                has_asu_client,
-            ) = await client.async_get_device_info()
+            probe = await self._async_probe()
         except Exception as err:
             raise UpdateFailed(
                 f"Error fetching device info for {self.ip}: {err}"
             ) from err
+        if "probe" in probe.errors:
+            # Keep the last snapshot instead of publishing a blank one
+            raise UpdateFailed(f"Probe of {self.ip} failed: {probe.errors['probe']}")
+
+        if probe.online:
+            previous = self._last_probe
+            if (
+                previous is not None
+                and previous.boot_id
+                and probe.boot_id
+                and probe.boot_id != previous.boot_id
+            ):
+                _LOGGER.info("Reboot detected on %s, board facts re-read", self.ip)
+                # Target/board may change after sysupgrade
+                self._pair_registered = False
+            self._last_probe = probe
+        board = probe.board
+        system = probe.system
+        target, board_name = board.target, board.board_name
 
         # 1.1) Gather boards
         if target and board_name and not self._pair_registered:
-            boards_registry = self.hass.data[DOMAIN]["boards"]
-            if board_name not in boards_registry.setdefault(target, set()):
-                boards_registry[target].add(board_name)
-                async_dispatcher_send(self.hass, SIGNAL_BOARDS_CHANGED)
+            self._register_pair(target, board_name)
             self._pair_registered = True
 
         # 2) Resolve TOH for this device from the shared cache
         version, sysupgrade_url = self._toh.get_os_info(target, board_name)
 
         # 3) Produce a typed snapshot for entities
-        result = {
-            "current_os_version": os_version,
-            "status": status,
-            "available_os_version": version,
-            "snapshot_url": sysupgrade_url,
-            "firmware_downloaded": fw_downloaded,
-            "firmware_file": fw_file,
-            "hostname": hostname,
-            "distribution": distribution,
-            "target": target,
-            "board_name": board_name,
-            "has_asu_client": has_asu_client,
-            "packages": pkgs,
-        }
+        result = DeviceSnapshot(
+            status=probe.online,
+            current_os_version=board.os_version,
+            available_os_version=version,
+            snapshot_url=sysupgrade_url,
+            firmware_downloaded=probe.firmware_downloaded,
+            firmware_file=probe.firmware_file,
+            hostname=board.hostname,
+            distribution=board.distribution,
+            target=target,
+            board_name=board_name,
+            has_asu_client=probe.has_asu_client,
+            packages=probe.packages,
+            uptime=system.uptime,
+            load_1m=system.load and system.load[0],
+            load_5m=system.load and system.load[1],
+            load_15m=system.load and system.load[2],
+            memory_total=system.memory_total,
+            memory_available=system.memory_available,
+            overlay_used_percent=system.root_used_percent,
+            tmp_used_percent=system.tmp_used_percent,
+            wan_address=system.wan_address,
+        )
         _LOGGER.debug(
             "Coordinator data: %s",
             result,
         )
+        self._adapt_interval(result)
+        if probe.online and "packages" not in probe.errors:
+            # Last known packages stay indexed while the device is offline or
+            # its package list could not be read
+            self.hass.data[DOMAIN]["inventory"].update(
+                self.ip, result.packages, result.current_os_version
+            )
+        if probe.online and not _PERSIST_BLOCKING_ERRORS & probe.errors.keys():
+            # Telemetry is left out: it is meaningless after a restart. A
+            # partial probe would replace the last good snapshot with blanks.
+            self.hass.data[DOMAIN]["snapshots"].save(
+                self.ip, result.as_dict(telemetry=False)
+            )
         return result
+
+    def _register_pair(self, target: str | None, board_name: str | None) -> None:
+        """Add a (target, board) pair to the shared registry of the TOH index."""
+        if not target or not board_name:
+            return
+        boards_registry = self.hass.data[DOMAIN]["boards"]
+        if board_name not in boards_registry.setdefault(target, set()):
+            boards_registry[target].add(board_name)
+            async_dispatcher_send(self.hass, SIGNAL_BOARDS_CHANGED)
+
+    def _adapt_interval(self, result: DeviceSnapshot) -> None:
+        """Feed the poll result to the adaptive policy and re-arm the timer."""
+        previous = self.data
+        # A persisted snapshot says nothing about recent activity
+        changed = (
+            previous is not None
+            and not previous.stale
+            and previous.static_fields() != result.static_fields()
+        )
+        available = result.available_os_version
+        pending = bool(available) and available != result.current_os_version
+        was_open = self._policy.breaker_open
+        interval = self._policy.record(result.status, changed, pending)
+        if self._policy.breaker_open and not was_open:
+            _LOGGER.warning(
+                "%s offline for %d polls, checking it with TCP probes only",
+                self.ip,
+                self._policy.failures,
+            )
+        if self._timer is not None:
+            self._timer.set_interval(timedelta(seconds=interval))
+        # Sweeps run every base interval; allow half of one as tolerance
+        self._sweep_after = time.monotonic() + interval - self._policy.base / 2
+
+    def poll_diagnostics(self) -> dict[str, Any]:
+        """Return adaptive schedule state."""
+        return {
+            "interval_seconds": self._policy.interval,
+            "consecutive_failures": self._policy.failures,
+            "breaker_open": self._policy.breaker_open,
+            "next_poll": self.next_poll,
+        }
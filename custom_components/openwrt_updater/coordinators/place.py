@@ -0,0 +1,107 @@
+"""Place coordinator polling all devices of a config entry in one sweep."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from ..helpers.const import DOMAIN
+from ..helpers.schedule import PhasedTimer
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from ..helpers.types import DeviceSnapshot
+    from .device import OpenWRTDeviceCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OpenWRTPlaceCoordinator(DataUpdateCoordinator[dict[str, DeviceSnapshot | None]]):
+    """Sweep every device of a place on one timer with bounded concurrency.
+
+    Data is keyed by IP. Entities stay subscribed to their device
+    coordinator, which receives its slice from the sweep and only notifies
+    them when that slice changed. Devices with their own schedule (event
+    stream) are left out of the sweep.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        devices: dict[str, OpenWRTDeviceCoordinator],
+    ) -> None:
+        """Initialize the place coordinator for a set of device coordinators."""
+        config = hass.data[DOMAIN]["config"]
+        super().__init__(
+            hass=hass,
+            logger=_LOGGER,
+            name=f"{DOMAIN}-place-{config_entry.data.get('place_name')}",
+            update_interval=None,
+        )
+        self.entry = config_entry
+        # Staggered like device polls, so places do not sweep in lockstep
+        self._timer = PhasedTimer(
+            hass,
+            f"place-{config_entry.entry_id}",
+            timedelta(minutes=config["device_timeout_minutes"]),
+            self.async_refresh,
+        )
+        self.devices = devices
+        self.concurrency = config["ssh_max_concurrency"]
+        self.last_sweep_seconds: float | None = None
+        self.last_sweep_changed = 0
+
+    def async_start(self) -> None:
+        """Arm the sweep timer until the entry unloads."""
+        self._timer.start()
+        self.entry.async_on_unload(self._timer.stop)
+
+    async def _async_update_data(self) -> dict[str, DeviceSnapshot | None]:
+        """Poll all swept devices and return the keyed snapshot."""
+        started = time.monotonic()
+        slots = asyncio.Semaphore(self.concurrency)
+        swept = {
+            ip: device for ip, device in self.devices.items() if not device.polls_itself
+        }
+
+        async def _sweep(device: OpenWRTDeviceCoordinator) -> bool:
+            """Poll one device within the concurrency bound.
+
+            An unexpected error only fails this device, not the whole sweep.
+            """
+            async with slots:
+                try:
+                    return await device.async_sweep()
+                except Exception as err:
+                    _LOGGER.exception("Unexpected error sweeping %s", device.ip)
+                    return device.async_set_sweep_failed(err)
+
+        changed = await asyncio.gather(*(_sweep(d) for d in swept.values()))
+        self.last_sweep_changed = sum(changed)
+        self.last_sweep_seconds = round(time.monotonic() - started, 3)
+        _LOGGER.debug(
+            "Swept %d devices of %s in %.1fs, %d changed",
+            len(swept),
+            self.name,
+            self.last_sweep_seconds,
+            self.last_sweep_changed,
+        )
+        return {ip: device.data for ip, device in self.devices.items()}
+
+    def diagnostics(self) -> dict:
+        """Return sweep statistics."""
+        return {
+            "devices": len(self.devices),
+            "concurrency": self.concurrency,
+            "last_sweep_seconds": self.last_sweep_seconds,
+            "last_sweep_changed": self.last_sweep_changed,
+            "next_sweep": self._timer.next_run,
+        }
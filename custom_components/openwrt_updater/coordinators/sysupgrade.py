@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.core import callback
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from ..helpers.const import DOMAIN, SIGNAL_BOARDS_CHANGED
@@ -20,12 +22,20 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# Window collecting new board registrations into one incremental update
+BOARD_BATCH_SECONDS = 5.0
+# Minimum spacing between two TOH network updates, full or incremental
+MIN_UPDATE_SPACING_SECONDS = 30.0
+
 
 class LocalTohCacheCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Maintains a persisted TOH cache and exposes a simple lookup.
 
     - Periodically fetches TOH from the network and saves raw JSON to HA Store.
     - On startup loads raw JSON from HA Store (so entities work offline).
+    - New (target, board) pairs reported by devices are collected for
+      BOARD_BATCH_SECONDS and resolved in one incremental update; network
+      updates are at least MIN_UPDATE_SPACING_SECONDS apart.
     """
 
     def __init__(self, hass: HomeAssistant, update_interval: timedelta) -> None:
@@ -37,6 +47,11 @@ class LocalTohCacheCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             update_interval=update_interval,
         )
         self._toh = LocalTOH(hass)
+        # Boards covered by the index, by target
+        self._indexed: dict[str, set[str]] = {}
+        self._unsub_batch: CALLBACK_TYPE | None = None
+        self._last_fetch: float | None = None
+        self.incremental_updates = 0
 
         self._unsub_signal = async_dispatcher_connect(
             hass, SIGNAL_BOARDS_CHANGED, self._on_boards_changed
@@ -44,11 +59,58 @@ class LocalTohCacheCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     @callback
     def _on_boards_changed(self) -> None:
-        """React to new (target, board) pairs by requesting a refresh."""
-        self.hass.async_create_task(self.async_request_refresh())
+        """Collect new (target, board) pairs into one delayed incremental update."""
+        if self._unsub_batch is not None:
+            return
+        delay = BOARD_BATCH_SECONDS
+        if self._last_fetch is not None:
+            delay = max(
+                delay, self._last_fetch + MIN_UPDATE_SPACING_SECONDS - time.monotonic()
+            )
+        self._unsub_batch = async_call_later(
+            self.hass, delay, self._async_apply_new_boards
+        )
+
+    def _pending_boards(self) -> dict[str, set[str]]:
+        """Return registered boards that the index does not cover yet."""
+        pending = {}
+        for target, boards in self.hass.data[DOMAIN]["boards"].items():
+            missing = boards - self._indexed.get(target, set())
+            if missing:
+                pending[target] = set(missing)
+        return pending
+
+    async def _async_apply_new_boards(self, _now) -> None:
+        """Resolve the collected boards and notify listeners once."""
+        self._unsub_batch = None
+        pending = self._pending_boards()
+        if not pending:
+            return
+        for target, boards in pending.items():
+            self._indexed.setdefault(target, set()).update(boards)
+        self._last_fetch = time.monotonic()
+        _LOGGER.debug(
+            "Adding %d boards of %d targets to TOH index",
+            sum(len(boards) for boards in pending.values()),
+            len(pending),
+        )
+        try:
+            await self._toh.extend_index(pending)
+        except Exception:
+            _LOGGER.warning("Incremental TOH update failed", exc_info=True)
+            # Leave them to the next registration or full refresh
+            for target, boards in pending.items():
+                self._indexed[target] -= boards
+            return
+        self._forget_failed(pending)
+        self.incremental_updates += 1
+        self.async_set_updated_data(self._toh.index)
 
     async def async_will_remove_from_hass(self) -> None:
-        """Unsubscribe from dispatcher signals."""
+        """Unsubscribe from dispatcher signals and drop a pending update."""
+        if self._unsub_batch is not None:
+            self._unsub_batch()
+            self._unsub_batch = None
         await super().async_will_remove_from_hass()
         if getattr(self, "_unsub_signal", None):
             self._unsub_signal()
@@ -68,15 +130,43 @@ class LocalTohCacheCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         Returns a built index. Entities should not parse
         this directly — use `get_for_devid()` for a normalized view.
         """
+        if (
+            self._last_fetch is not None
+            and time.monotonic() - self._last_fetch < MIN_UPDATE_SPACING_SECONDS
+        ):
+            _LOGGER.debug("TOH updated recently, skipping refresh")
+            return self._toh.index
+        # A full rebuild covers everything registered so far
+        if self._unsub_batch is not None:
+            self._unsub_batch()
+            self._unsub_batch = None
+        registered = {
+            target: set(boards)
+            for target, boards in self.hass.data[DOMAIN]["boards"].items()
+        }
+        self._last_fetch = time.monotonic()
         try:
             raw = await self._toh.download_overview()
             await self._toh.build_index(raw)
+            self._indexed = registered
+            self._forget_failed(registered)
         except Exception:
             _LOGGER.warning(
                 "TOH update failed, using cached data if available", exc_info=True
             )
         return self._toh.index
 
+    def _forget_failed(self, boards: dict[str, set[str]]) -> None:
+        """Mark boards of targets whose profiles failed as not indexed yet.
+
+        The next board registration or full refresh then retries them.
+        """
+        for target in self._toh.failed_targets:
+            if target in boards:
+                self._indexed[target] = (
+                    self._indexed.get(target, set()) - boards[target]
+                )
+
     def get_os_info(self, target: str, board: str):
         """Parse index and return OS info for selected board."""
         toh_index = self.data or {}
@@ -84,3 +174,17 @@ class LocalTohCacheCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         if os_info == {}:
             return None, None
         return os_info["version"], os_info["sysupgrade_url"]
+
+    def diagnostics(self) -> dict:
+        """Return index coverage and update statistics."""
+        return {
+            "targets": len(self._toh.index),
+            "boards": sum(len(boards) for boards in self._toh.index.values()),
+            "pending": sum(len(b) for b in self._pending_boards().values()),
+            "batch_scheduled": self._unsub_batch is not None,
+            "incremental_updates": self.incremental_updates,
+            "failed_targets": self._toh.failed_targets,
+            "last_update_ago": None
+            if self._last_fetch is None
+            else round(time.monotonic() - self._last_fetch, 1),
+        }
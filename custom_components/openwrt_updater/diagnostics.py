@@ -0,0 +1,58 @@
+"""Diagnostics support for OpenWRT Updater."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .helpers.const import DOMAIN
+from .helpers.push_agent import PUSH_TOKENS_KEY, WEBHOOK_ID_KEY
+
+TO_REDACT = {"ubus_password", WEBHOOK_ID_KEY, PUSH_TOKENS_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    The global entry reports the shared SSH pool; place entries report each
+    device's coordinator data and learned SSH timeouts.
+    """
+    ssh_pool = hass.data[DOMAIN]["ssh_pool"].diagnostics()
+    if entry.unique_id == "__global__":
+        toh = hass.data[DOMAIN].get("toh_index")
+        return {
+            "config": async_redact_data(hass.data[DOMAIN].get("config", {}), TO_REDACT),
+            "ssh_pool": ssh_pool,
+            "liveness": hass.data[DOMAIN]["liveness"].diagnostics(),
+            "toh": toh and toh.diagnostics(),
+            "inventory": hass.data[DOMAIN]["inventory"].diagnostics(),
+            "summary": hass.data[DOMAIN]["summary"].diagnostics(),
+        }
+
+    entry_data = hass.data[DOMAIN].get(entry.entry_id, {})
+    devices: dict[str, Any] = {}
+    for ip in entry.options.get("devices", {}):
+        coordinator = entry_data.get(ip, {}).get("coordinator")
+        devices[ip] = {
+            "last_update_success": coordinator and coordinator.last_update_success,
+            "data": coordinator and coordinator.data and coordinator.data.as_dict(),
+            "ssh": ssh_pool["hosts"].get(ip, {}),
+            "push_fresh": coordinator and coordinator.push_is_fresh,
+            "schedule": coordinator and coordinator.poll_diagnostics(),
+            "event_stream": coordinator
+            and coordinator.event_stream
+            and coordinator.event_stream.diagnostics(),
+        }
+    place = entry_data.get("place_coordinator")
+    summary = entry_data.get("summary")
+    return {
+        "place": async_redact_data(dict(entry.data), TO_REDACT),
+        "sweep": place and place.diagnostics(),
+        "summary": summary and summary.diagnostics(),
+        "devices": devices,
+    }
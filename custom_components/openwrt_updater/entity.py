@@ -0,0 +1,43 @@
+"""Base entity for OpenWRT device coordinator entities."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+
+class OpenWRTEntity(CoordinatorEntity):
+    """Coordinator entity that only writes state when its own fields change.
+
+    Subclasses list the DeviceSnapshot fields their state and availability
+    depend on in `_snapshot_fields`; telemetry changing on every poll then
+    does not rewrite the state of unrelated entities.
+    """
+
+    _snapshot_fields: tuple[str, ...] = ()
+    _written: tuple[Any, ...] | None = None
+
+    def _snapshot_value(self, field: str, default: Any = None) -> Any:
+        """Return a field of the current snapshot, or `default` without one."""
+        if self.coordinator.data is None:
+            return default
+        return getattr(self.coordinator.data, field)
+
+    def _state_inputs(self) -> tuple[Any, ...]:
+        """Return everything this entity's state is derived from."""
+        return (
+            self.coordinator.last_update_success,
+            self.coordinator.data is None,
+            *(self._snapshot_value(field) for field in self._snapshot_fields),
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when one of the watched fields changed."""
+        inputs = self._state_inputs()
+        if inputs == self._written:
+            return
+        self._written = inputs
+        self.async_write_ha_state()
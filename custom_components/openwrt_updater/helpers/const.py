@@ -2,14 +2,23 @@
 
 DOMAIN = "openwrt_updater"
 SIGNAL_BOARDS_CHANGED = f"{DOMAIN}_boards_changed"
+EVENT_UPGRADE_LOG = f"{DOMAIN}_upgrade_log"
 
 INTEGRATION_DEFAULTS = {
     "builder_location": "zip@10.8.25.20:/home/zip/OpenWrt-builder/",
     "ssh_key_path": "ssh_keys/id_ed25519",
     "toh_timeout_hours": 24,
     "device_timeout_minutes": 10,
+    "device_max_interval_minutes": 60,
+    "event_poll_minutes": 60,
+    "place_batch_polling": False,
     "asu_base_url": "https://sysupgrade.openwrt.org/",
     "download_base_url": "https://downloads.openwrt.org/",
+    "ssh_timeout_min_seconds": 2,
+    "ssh_timeout_max_seconds": 60,
+    "ssh_max_concurrency": 10,
+    "ubus_username": "root",
+    "ubus_password": "",
 }
 
 
@@ -21,3 +30,13 @@ def get_device_info(place_name: str, ip: str) -> dict:
         "manufacturer": "OpenWRT",
         "model": "Router",
     }
+
+
+def get_fleet_device_info(key: str, name: str) -> dict:
+    """Return device info for the summary entities of a place or the fleet."""
+    return {
+        "identifiers": {(DOMAIN, f"fleet_{key}")},
+        "name": name,
+        "manufacturer": "OpenWRT",
+        "model": "Fleet",
+    }
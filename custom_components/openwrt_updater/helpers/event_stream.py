@@ -0,0 +1,152 @@
+"""Persistent `ubus listen` session turning device events into callbacks.
+
+The stream runs over the pooled SSH connection of the device. A relevant
+event, a (re)connect and a dropped stream all mean the last snapshot may be
+stale, so each of them is reported to the owner, which refreshes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import json
+import logging
+import shlex
+import time
+
+import asyncssh
+
+from .ssh_client import OpenWRTSSH, SSHConnectionPool
+
+_LOGGER = logging.getLogger(__name__)
+
+# ubus event patterns worth a refresh: interface up/down and uci commits
+RELEVANT_EVENTS = ("network.interface", "config.change")
+# Reconnect delay grows from MIN to MAX seconds while the device stays away
+BACKOFF_MIN_SECONDS = 5.0
+BACKOFF_MAX_SECONDS = 300.0
+# A stream that lived this long resets the backoff
+STABLE_STREAM_SECONDS = 60.0
+
+
+def parse_event_line(line: str) -> tuple[str, dict] | None:
+    """Parse one `ubus listen` line `{ "event": { ...data } }`.
+
+    Returns (event, data) or None for anything that is not an event object.
+    """
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(message, dict) or len(message) != 1:
+        return None
+    ((event, data),) = message.items()
+    return event, data if isinstance(data, dict) else {}
+
+
+class DeviceEventStream:
+    """Keep a `ubus listen` session open to one device and reconnect with backoff.
+
+    `on_change` is called with a short reason whenever the device state may
+    have changed: on a relevant event, after (re)connecting and when the
+    stream drops.
+    """
+
+    def __init__(
+        self,
+        ip: str,
+        key_path: str,
+        pool: SSHConnectionPool,
+        on_change: Callable[[str], None],
+        jump: tuple[str, str] | None = None,
+        events: tuple[str, ...] = RELEVANT_EVENTS,
+    ) -> None:
+        """Initialize the stream; call `start()` to run it."""
+        self.ip = ip
+        self.key_path = key_path
+        self.pool = pool
+        self.jump = jump
+        self.events = events
+        self._on_change = on_change
+        self._task: asyncio.Task | None = None
+        self.connected = False
+        self.events_received = 0
+        self.reconnects = 0
+
+    @property
+    def command(self) -> str:
+        """Remote command producing one JSON event per line."""
+        return "exec ubus listen " + " ".join(shlex.quote(e) for e in self.events)
+
+    def start(self, create_task: Callable[..., asyncio.Task]) -> None:
+        """Start the background loop using the given task factory."""
+        if self._task is None or self._task.done():
+            self._task = create_task(self._run(), f"openwrt-events-{self.ip}")
+
+    async def async_stop(self) -> None:
+        """Stop the loop and close the remote `ubus listen` process."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Listen, and reconnect with exponential backoff when the stream ends."""
+        backoff = BACKOFF_MIN_SECONDS
+        while True:
+            started = time.monotonic()
+            try:
+                await self._listen()
+            except (TimeoutError, asyncssh.Error, OSError) as err:
+                _LOGGER.debug("Event stream of %s failed: %s", self.ip, err)
+            except Exception:
+                # Pool closed during a reload, bad output, a failing callback:
+                # still reconnect rather than stay on the safety-net interval
+                _LOGGER.exception("Unexpected error in event stream of %s", self.ip)
+
+            if self.connected:
+                self.connected = False
+                self._on_change("stream dropped")
+            if time.monotonic() - started >= STABLE_STREAM_SECONDS:
+                backoff = BACKOFF_MIN_SECONDS
+            _LOGGER.debug("Reconnecting event stream of %s in %.0fs", self.ip, backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, BACKOFF_MAX_SECONDS)
+            self.reconnects += 1
+
+    async def _listen(self) -> None:
+        """Run one `ubus listen` session until it ends."""
+        # Held open indefinitely, so it must not occupy a scheduler slot
+        async with OpenWRTSSH(
+            self.ip, self.key_path, pool=self.pool, jump=self.jump, priority=None
+        ) as client:
+            if not client.available:
+                return
+            lines = client.stream_lines(self.command)
+            try:
+                # Catch up on anything missed while disconnected
+                self.connected = True
+                self._on_change("stream connected")
+                async for line in lines:
+                    parsed = parse_event_line(line)
+                    if parsed is None:
+                        continue
+                    event, data = parsed
+                    self.events_received += 1
+                    _LOGGER.debug("Event from %s: %s %s", self.ip, event, data)
+                    self._on_change(event)
+            finally:
+                await lines.aclose()
+
+    def diagnostics(self) -> dict:
+        """Return stream state for diagnostics."""
+        return {
+            "connected": self.connected,
+            "events": list(self.events),
+            "events_received": self.events_received,
+            "reconnects": self.reconnects,
+        }
@@ -5,6 +5,7 @@ import contextlib
 import json
 import logging
 from pathlib import Path
+import re
 
 import voluptuous as vol
 import yaml
@@ -45,6 +46,26 @@ def save_device_option(
     _LOGGER.debug("Saved values: %s", entry.options.get("devices", {}).get(ip, {}))
 
 
+def parse_builder_location(location: str) -> tuple[str, str, str]:
+    """Split builder_location 'user@host:/dir' into (user, host, dir)."""
+    match = re.fullmatch(r"([^@]+)@([^:]+):(.+)", location)
+    if not match:
+        raise ValueError(
+            f"Invalid builder_location: {location!r}, expected format 'user@host:/dir'"
+        )
+    return match.group(1), match.group(2), match.group(3)
+
+
+def get_jump_host(hass: HomeAssistant, entry: ConfigEntry, ip: str) -> tuple | None:
+    """Return (username, host) of the builder node if the device polls through it."""
+    if not load_device_option(entry, ip, "use_jump_host", False):
+        return None
+    username, host, _ = parse_builder_location(
+        hass.data[DOMAIN]["config"]["builder_location"]
+    )
+    return username, host
+
+
 def load_config_types(config_path: str) -> dict:
     """Load configuration types from a YAML file."""
     config_path = Path(config_path)
@@ -89,6 +110,32 @@ def build_global_options_schema(
                 "device_timeout_minutes",
                 default=defaults["device_timeout_minutes"],
             ): int,
+            vol.Optional(
+                "device_max_interval_minutes",
+                default=defaults["device_max_interval_minutes"],
+            ): int,
+            vol.Optional(
+                "place_batch_polling",
+                default=defaults["place_batch_polling"],
+            ): cv.boolean,
+            vol.Optional(
+                "event_poll_minutes",
+                default=defaults["event_poll_minutes"],
+            ): int,
+            vol.Optional(
+                "ssh_timeout_min_seconds",
+                default=defaults["ssh_timeout_min_seconds"],
+            ): int,
+            vol.Optional(
+                "ssh_timeout_max_seconds",
+                default=defaults["ssh_timeout_max_seconds"],
+            ): int,
+            vol.Optional(
+                "ssh_max_concurrency",
+                default=defaults["ssh_max_concurrency"],
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional("ubus_username", default=defaults["ubus_username"]): cv.string,
+            vol.Optional("ubus_password", default=defaults["ubus_password"]): cv.string,
         }
     )
 
@@ -113,6 +160,14 @@ def build_device_schema(
             # ): vol.In(choices),
             vol.Required("simple_update", default=d.get("simple_update", True)): bool,
             vol.Required("force_update", default=d.get("force_update", False)): bool,
+            vol.Required("use_jump_host", default=d.get("use_jump_host", False)): bool,
+            vol.Required("use_ubus_http", default=d.get("use_ubus_http", False)): bool,
+            vol.Required(
+                "use_event_stream", default=d.get("use_event_stream", False)
+            ): bool,
+            vol.Required(
+                "use_push_agent", default=d.get("use_push_agent", False)
+            ): bool,
             vol.Optional("add_another", default=d.get("add_another", False)): bool,
         }
     )
@@ -126,11 +181,14 @@ def upsert_device(devices: dict, user_input: dict) -> dict:
         # "config_type": user_input["config_type"],
         "simple_update": user_input["simple_update"],
         "force_update": user_input["force_update"],
+        "use_jump_host": user_input.get("use_jump_host", False),
+        "use_ubus_http": user_input.get("use_ubus_http", False),
+        "use_event_stream": user_input.get("use_event_stream", False),
+        "use_push_agent": user_input.get("use_push_agent", False),
     }
     return devices
 
 
-
 async def dump_toh_json(
     hass: HomeAssistant,
     data,
@@ -0,0 +1,93 @@
+"""Fleet-wide package inventory: package -> devices, and firmware versions.
+
+Device coordinators report their interned package set after each online
+poll. Only a different set is applied, as a diff against the previous one,
+so steady-state polls cost one identity check.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PackageInventory:
+    """Inverted index from package name to device IPs, kept up to date by diffs."""
+
+    def __init__(self) -> None:
+        """Initialize an empty inventory."""
+        self._devices: dict[str, set[str]] = {}
+        self._packages: dict[str, frozenset[str]] = {}
+        self._versions: dict[str, str | None] = {}
+        self._version_counts: Counter[str | None] = Counter()
+
+    @property
+    def fleet(self) -> set[str]:
+        """Return IPs of all devices in the inventory."""
+        return set(self._packages)
+
+    def update(self, ip: str, packages: frozenset[str], os_version: str | None) -> None:
+        """Apply the latest package set and firmware version of a device."""
+        old = self._packages.get(ip)
+        if old is not packages and old != packages:
+            old = old or frozenset()
+            for name in old - packages:
+                devices = self._devices[name]
+                devices.discard(ip)
+                if not devices:
+                    del self._devices[name]
+            for name in packages - old:
+                self._devices.setdefault(name, set()).add(ip)
+            _LOGGER.debug(
+                "Packages of %s: +%d -%d", ip, len(packages - old), len(old - packages)
+            )
+        self._packages[ip] = packages
+
+        if ip not in self._versions or self._versions[ip] != os_version:
+            self._forget_version(ip)
+            self._versions[ip] = os_version
+            self._version_counts[os_version] += 1
+
+    def remove(self, ip: str) -> None:
+        """Drop a device from the inventory."""
+        for name in self._packages.pop(ip, frozenset()):
+            devices = self._devices[name]
+            devices.discard(ip)
+            if not devices:
+                del self._devices[name]
+        self._forget_version(ip)
+        self._versions.pop(ip, None)
+
+    def _forget_version(self, ip: str) -> None:
+        """Remove the device's current version from the histogram."""
+        if ip not in self._versions:
+            return
+        version = self._versions[ip]
+        self._version_counts[version] -= 1
+        if not self._version_counts[version]:
+            del self._version_counts[version]
+
+    def devices_with(self, package: str) -> set[str]:
+        """Return IPs of devices that have `package` installed."""
+        return set(self._devices.get(package, ()))
+
+    def devices_without(self, package: str) -> set[str]:
+        """Return IPs of devices that do not have `package` installed."""
+        return self.fleet - self._devices.get(package, set())
+
+    def version_histogram(self) -> dict[str, int]:
+        """Return the number of devices per firmware version."""
+        return {
+            version or "unknown": count
+            for version, count in self._version_counts.most_common()
+        }
+
+    def diagnostics(self) -> dict:
+        """Return inventory size."""
+        return {
+            "devices": len(self._packages),
+            "distinct_packages": len(self._devices),
+            "firmware_versions": self.version_histogram(),
+        }
@@ -0,0 +1,145 @@
+"""Per-device latency history used to derive adaptive SSH timeouts."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import math
+
+# Relative accuracy of the quantile sketch (bucket width ratio)
+_SKETCH_GAMMA = 1.1
+# Halve all sketch counts once this many samples are held, so old
+# samples fade out and the sketch follows the current link quality
+_SKETCH_MAX_COUNT = 200
+# Weight of the newest sample in the moving average
+_EWMA_ALPHA = 0.2
+# Samples needed before learned values replace the defaults
+MIN_SAMPLES = 5
+# Learned timeout = max(p99 * _P99_FACTOR, ewma * _EWMA_FACTOR)
+_P99_FACTOR = 2.0
+_EWMA_FACTOR = 4.0
+# Each timeout in a row adds this much to the next timeout (1.5 = +50%),
+# up to _MAX_ESCALATION times the learned or default value
+_TIMEOUT_STEP = 0.5
+_MAX_ESCALATION = 2.0
+
+
+@dataclass(slots=True)
+class QuantileSketch:
+    """Log-bucketed histogram giving quantiles within _SKETCH_GAMMA accuracy."""
+
+    buckets: dict[int, float] = field(default_factory=dict)
+    count: float = 0.0
+
+    def add(self, value: float) -> None:
+        """Add one sample (seconds)."""
+        index = math.ceil(math.log(max(value, 1e-3), _SKETCH_GAMMA))
+        self.buckets[index] = self.buckets.get(index, 0.0) + 1.0
+        self.count += 1.0
+        if self.count > _SKETCH_MAX_COUNT:
+            self.buckets = {i: c / 2 for i, c in self.buckets.items() if c / 2 >= 0.25}
+            self.count = sum(self.buckets.values())
+
+    def quantile(self, q: float) -> float | None:
+        """Return the approximate q-quantile, or None without samples."""
+        if not self.buckets:
+            return None
+        rank = q * self.count
+        seen = 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return _SKETCH_GAMMA**index
+        return _SKETCH_GAMMA ** max(self.buckets)
+
+
+@dataclass(slots=True)
+class CommandLatency:
+    """Latency history for one kind of operation on one device."""
+
+    ewma: float | None = None
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    samples: int = 0
+    timeouts: int = 0
+    # Timeouts since the last completed operation
+    consecutive_timeouts: int = 0
+
+    def record(self, seconds: float) -> None:
+        """Record a completed operation."""
+        self.consecutive_timeouts = 0
+        self.ewma = (
+            seconds
+            if self.ewma is None
+            else _EWMA_ALPHA * seconds + (1 - _EWMA_ALPHA) * self.ewma
+        )
+        self.sketch.add(seconds)
+        self.samples += 1
+
+    def record_timeout(self) -> None:
+        """Record an operation that hit its timeout.
+
+        Timeouts are counted apart from the samples: a dead device would
+        otherwise drag the learned timeout up for a long time after it
+        recovers.
+        """
+        self.timeouts += 1
+        self.consecutive_timeouts += 1
+
+    @property
+    def escalation(self) -> float:
+        """Return the factor applied after timeouts in a row (1.0 if none)."""
+        return min(1.0 + _TIMEOUT_STEP * self.consecutive_timeouts, _MAX_ESCALATION)
+
+
+class LatencyTracker:
+    """Rolling latency history of one device, per operation kind.
+
+    Kinds used by OpenWRTSSH are "connect", "probe" and "command".
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty history."""
+        self._kinds: dict[str, CommandLatency] = {}
+
+    def record(self, kind: str, seconds: float) -> None:
+        """Record a completed operation of the given kind."""
+        self._kinds.setdefault(kind, CommandLatency()).record(seconds)
+
+    def record_timeout(self, kind: str) -> None:
+        """Record an operation of the given kind that timed out."""
+        self._kinds.setdefault(kind, CommandLatency()).record_timeout()
+
+    def timeout_for(
+        self, kind: str, default: float, bounds: tuple[float, float]
+    ) -> float:
+        """Return the timeout to use for kind, learned from history.
+
+        Falls back to `default` until MIN_SAMPLES are collected. Timeouts in
+        a row raise the value by a bounded factor until the next completed
+        operation; the result is always clamped to `bounds` (min, max).
+        """
+        lower, upper = bounds
+        stats = self._kinds.get(kind)
+        if stats is None:
+            return min(max(default, lower), upper)
+        if stats.samples < MIN_SAMPLES or stats.ewma is None:
+            learned = default
+        else:
+            p99 = stats.sketch.quantile(0.99) or stats.ewma
+            learned = max(p99 * _P99_FACTOR, stats.ewma * _EWMA_FACTOR)
+        return min(max(learned * stats.escalation, lower), upper)
+
+    def as_dict(self, defaults: dict[str, float], bounds: tuple[float, float]) -> dict:
+        """Return learned values for diagnostics."""
+        result = {}
+        for kind, stats in self._kinds.items():
+            p99 = stats.sketch.quantile(0.99)
+            timeout = self.timeout_for(kind, defaults.get(kind, bounds[1]), bounds)
+            result[kind] = {
+                "samples": stats.samples,
+                "timeouts": stats.timeouts,
+                "consecutive_timeouts": stats.consecutive_timeouts,
+                "ewma": None if stats.ewma is None else round(stats.ewma, 3),
+                "p99": None if p99 is None else round(p99, 3),
+                "timeout": round(timeout, 3),
+            }
+        return result
@@ -0,0 +1,168 @@
+"""Fleet liveness scanner: one task watching devices that are expected back.
+
+After a reboot or upgrade, coordinators ask the scanner to watch their
+device instead of each running its own polling loop. The scanner probes due
+devices in bounded batches with a TCP connect to port 22, backs off per
+device, and calls the registered callbacks as soon as a device answers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .helpers import async_check_alive
+
+_LOGGER = logging.getLogger(__name__)
+
+# Concurrent TCP probes per scan
+BATCH_SIZE = 32
+# Longest delay between two probes of one device
+MAX_BACKOFF_SECONDS = 30.0
+
+
+@dataclass(slots=True)
+class _Watch:
+    """Liveness watch of one device."""
+
+    deadline: float
+    delay: float
+    timeout: float
+    next_check: float = 0.0
+    attempts: int = 0
+    callbacks: list[Callable[[], None]] = field(default_factory=list)
+
+
+class LivenessScanner:
+    """Watch a set of devices until they answer on port 22 or time out.
+
+    Watching a device that is already tracked merges the requests: the
+    later deadline wins and every callback is kept.
+    """
+
+    def __init__(self, hass: HomeAssistant, port: int = 22) -> None:
+        """Initialize an idle scanner."""
+        self.hass = hass
+        self.port = port
+        self._watches: dict[str, _Watch] = {}
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    def watch(
+        self,
+        ip: str,
+        on_alive: Callable[[], None],
+        *,
+        interval: float = 5.0,
+        max_duration: float = 180.0,
+        timeout: float = 1.0,
+    ) -> None:
+        """Start or extend watching `ip`; `on_alive` runs once it answers."""
+        now = time.monotonic()
+        current = self._watches.get(ip)
+        if current is None:
+            current = self._watches[ip] = _Watch(
+                deadline=now + max_duration,
+                delay=interval,
+                timeout=timeout,
+                next_check=now + interval,
+            )
+        else:
+            current.deadline = max(current.deadline, now + max_duration)
+            current.delay = min(current.delay, interval)
+        if on_alive not in current.callbacks:
+            current.callbacks.append(on_alive)
+
+        if self._task is None or self._task.done():
+            self._task = self.hass.async_create_background_task(
+                self._run(), "openwrt-liveness-scanner"
+            )
+        self._wakeup.set()
+
+    def unwatch(self, ip: str) -> None:
+        """Stop watching `ip` without calling its callbacks."""
+        self._watches.pop(ip, None)
+
+    def is_watching(self, ip: str) -> bool:
+        """Return whether `ip` is being watched."""
+        return ip in self._watches
+
+    async def async_stop(self) -> None:
+        """Drop all watches and stop the scanner task."""
+        self._watches.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Probe due devices until nothing is left to watch."""
+        while self._watches:
+            now = time.monotonic()
+            for ip in [ip for ip, w in self._watches.items() if w.deadline <= now]:
+                watch = self._watches.pop(ip)
+                _LOGGER.warning(
+                    "%s did not come back after %d liveness checks",
+                    ip,
+                    watch.attempts,
+                )
+
+            due = [ip for ip, w in self._watches.items() if w.next_check <= now]
+            if due:
+                await self._scan(due)
+
+            if not self._watches:
+                break
+            sleep_for = min(w.next_check for w in self._watches.values())
+            self._wakeup.clear()
+            try:
+                async with asyncio.timeout(max(sleep_for - time.monotonic(), 0)):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+
+    async def _scan(self, ips: list[str]) -> None:
+        """Probe devices in bounded batches and notify those that answer."""
+        slots = asyncio.Semaphore(BATCH_SIZE)
+
+        async def _probe(ip: str) -> tuple[str, bool]:
+            """Probe one device within the batch bound."""
+            async with slots:
+                watch = self._watches.get(ip)
+                if watch is None:
+                    return ip, False
+                return ip, await async_check_alive(ip, self.port, watch.timeout)
+
+        for ip, alive in await asyncio.gather(*(_probe(ip) for ip in ips)):
+            watch = self._watches.get(ip)
+            if watch is None:
+                continue
+            watch.attempts += 1
+            if alive:
+                del self._watches[ip]
+                _LOGGER.debug("%s is alive after %d checks", ip, watch.attempts)
+                for callback in watch.callbacks:
+                    callback()
+                continue
+            watch.next_check = time.monotonic() + watch.delay
+            watch.delay = min(watch.delay * 2, MAX_BACKOFF_SECONDS)
+
+    def diagnostics(self) -> dict:
+        """Return the devices being watched."""
+        now = time.monotonic()
+        return {
+            ip: {
+                "attempts": w.attempts,
+                "next_check_in": round(max(w.next_check - now, 0), 1),
+                "expires_in": round(max(w.deadline - now, 0), 1),
+            }
+            for ip, w in self._watches.items()
+        }
@@ -0,0 +1,315 @@
+"""Single round-trip device probe: remote script and output parser.
+
+The probe runs every section in one `sh -c` on the device. Each section is
+framed by marker lines so the output can be split in one pass and a failure
+in one section does not discard the others:
+
+    @@owrt begin <section>
+    <section stdout>
+    @@owrt end <section> <exit status>
+    @@owrt error <section> <first stderr line>   (only if stderr is not empty)
+
+A section may print `@@owrt skip <section>` instead of its payload when the
+caller already holds an up-to-date copy (board facts while the kernel boot id
+is unchanged, the package list while the package database fingerprint is
+unchanged); the previous value is then reused.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import shlex
+
+from .types import BoardInfo, DeviceProbe, ProbeSection, SystemInfo, intern_packages
+
+_LOGGER = logging.getLogger(__name__)
+
+MARKER = "@@owrt"
+
+# Runs one section function, keeping its stdout and capturing its stderr
+_SECTION_RUNNER = f"""\
+_sec() {{
+	echo "{MARKER} begin $1"
+	{{ _e=$( {{ "$2"; }} 2>&1 1>&3 ); _rc=$?; }} 3>&1
+	echo "{MARKER} end $1 $_rc"
+	[ -n "$_e" ] && echo "{MARKER} error $1 $(echo "$_e" | head -n1)"
+	return 0
+}}
+_skip() {{
+	echo "{MARKER} skip $1"
+}}
+"""
+
+# Token identifying the current boot: kernel boot_id, or boot time from
+# /proc/stat on kernels without it.
+# Package database fingerprint: manager, mtime and size of the opkg status
+# file or the apk installed database (see PACKAGE_DBS).
+_PRELUDE = """\
+_boot=$(cat /proc/sys/kernel/random/boot_id 2>/dev/null)
+[ -n "$_boot" ] || _boot=$(sed -n 's/^btime /btime:/p' /proc/stat)
+_pm=
+_pkgdb=
+if [ -f /usr/lib/opkg/status ]; then
+	_pm=opkg
+	_pkgdb=/usr/lib/opkg/status
+elif [ -f /lib/apk/db/installed ]; then
+	_pm=apk
+	_pkgdb=/lib/apk/db/installed
+fi
+_pkgfp=
+[ -n "$_pm" ] && _pkgfp="$_pm:$(date -r "$_pkgdb" +%s):$(wc -c <"$_pkgdb")"
+"""
+
+# Package manager -> installed packages database, in detection order
+PACKAGE_DBS: dict[str, str] = {
+    "opkg": "/usr/lib/opkg/status",
+    "apk": "/lib/apk/db/installed",
+}
+
+# Section name -> shell body. Order defines the order of the output.
+PROBE_SECTIONS: dict[str, str] = {
+    "boot": 'echo "$_boot"',
+    "firmware": "ls -1 /tmp/openwrt*.bin 2>/dev/null | head -n1",
+    "board": """\
+if [ -n "$_boot" ] && [ "$_boot" = "$KNOWN_BOOT_ID" ]; then
+	_skip board
+	return 0
+fi
+ubus call system board""",
+    "sysinfo": "ubus call system info",
+    # APs and other devices without a wan interface report nothing
+    "wan": "ubus call network.interface.wan status 2>/dev/null || echo '{}'",
+    "pkgdb": 'echo "$_pkgfp"',
+    "packages": """\
+if [ -n "$_pkgfp" ] && [ "$_pkgfp" = "$KNOWN_PKG_FP" ]; then
+	_skip packages
+	return 0
+fi
+case "$_pm" in
+opkg) awk '/^Package:/ { p = $2 } /^Status:.* installed$/ { print p }' "$_pkgdb" ;;
+apk) sed -n 's/^P://p' "$_pkgdb" ;;
+*) echo "no opkg or apk package database found" >&2; return 1 ;;
+esac""",
+}
+
+
+def build_probe_script(
+    previous: DeviceProbe | None = None, sections: dict[str, str] | None = None
+) -> str:
+    """Compose the remote probe script for the given sections.
+
+    Facts from `previous` are passed to the device so unchanged sections can
+    be skipped.
+    """
+    known_boot_id = ""
+    known_pkg_fp = ""
+    if previous is not None:
+        if previous.boot_id and "board" not in previous.errors:
+            known_boot_id = previous.boot_id
+        if previous.package_fingerprint and "packages" not in previous.errors:
+            known_pkg_fp = previous.package_fingerprint
+    header = (
+        f"KNOWN_BOOT_ID={shlex.quote(known_boot_id)}\n"
+        f"KNOWN_PKG_FP={shlex.quote(known_pkg_fp)}\n"
+    )
+    return header + build_probe_body(sections)
+
+
+def build_probe_body(sections: dict[str, str] | None = None) -> str:
+    """Return the probe script without the KNOWN_* header.
+
+    Reads KNOWN_BOOT_ID and KNOWN_PKG_FP from the environment, which lets
+    the push agent run the same probe in a loop with its own state.
+    """
+    sections = PROBE_SECTIONS if sections is None else sections
+    functions = "".join(
+        f"_s_{name}() {{\n\t{body.replace(chr(10), chr(10) + chr(9))}\n}}\n"
+        for name, body in sections.items()
+    )
+    calls = "".join(f"_sec {name} _s_{name}\n" for name in sections)
+    return f"{_SECTION_RUNNER}{_PRELUDE}{functions}{calls}"
+
+
+def parse_probe_output(text: str) -> dict[str, ProbeSection]:
+    """Split framed probe output into sections in a single pass."""
+    sections: dict[str, ProbeSection] = {}
+    current: ProbeSection | None = None
+    body: list[str] = []
+
+    for line in text.splitlines():
+        if not line.startswith(MARKER):
+            if current is not None:
+                body.append(line)
+            continue
+
+        _, kind, *rest = line.split(" ", 3)
+        name = rest[0] if rest else ""
+        if kind == "begin":
+            current = sections.setdefault(name, ProbeSection(name=name))
+            body = []
+        elif kind == "end" and current is not None and current.name == name:
+            current.body = "\n".join(body)
+            try:
+                current.exit_status = int(rest[1])
+            except (IndexError, ValueError):
+                current.exit_status = None
+            current = None
+        elif kind == "skip":
+            sections.setdefault(name, ProbeSection(name=name)).skipped = True
+        elif kind == "error":
+            section = sections.setdefault(name, ProbeSection(name=name))
+            section.error = rest[1] if len(rest) > 1 else ""
+
+    # A section without an end marker was cut off (timeout, dropped session)
+    if current is not None:
+        current.body = "\n".join(body)
+        current.error = current.error or "section output truncated"
+
+    return sections
+
+
+def _section_failure(section: ProbeSection | None) -> str | None:
+    """Return an error description if a section did not complete cleanly."""
+    if section is None:
+        return "section missing from output"
+    if section.error:
+        return section.error
+    if not section.ok:
+        return f"exit status {section.exit_status}"
+    return None
+
+
+def board_info_from_ubus(board: dict) -> BoardInfo:
+    """Convert the `system board` ubus reply into BoardInfo."""
+    release = board.get("release", {})
+    return BoardInfo(
+        hostname=board.get("hostname"),
+        os_version=release.get("version"),
+        distribution=release.get("distribution"),
+        target=release.get("target"),
+        board_name=board.get("board_name"),
+    )
+
+
+def system_info_from_ubus(info: dict, wan: dict | None = None) -> SystemInfo:
+    """Convert `system info` and `network.interface.wan status` replies."""
+    memory = info.get("memory", {})
+    root = info.get("root", {})
+    tmp = info.get("tmp", {})
+    load = info.get("load")
+    # The kernel reports load averages as fixed point with 16 fraction bits
+    if isinstance(load, list) and len(load) == 3:
+        load = tuple(round(value / 65536, 2) for value in load)
+    else:
+        load = None
+    available = memory.get("available")
+    if available is None and "free" in memory:
+        available = memory["free"] + memory.get("buffered", 0)
+    addresses = (wan or {}).get("ipv4-address") or [{}]
+    return SystemInfo(
+        uptime=info.get("uptime"),
+        load=load,
+        memory_total=_kib(memory.get("total")),
+        memory_available=_kib(available),
+        root_total=root.get("total"),
+        root_used=root.get("used"),
+        tmp_total=tmp.get("total"),
+        tmp_used=tmp.get("used"),
+        wan_address=addresses[0].get("address"),
+    )
+
+
+def _kib(value: int | None) -> int | None:
+    """Convert bytes from `system info` memory to KiB."""
+    return None if value is None else value // 1024
+
+
+def package_fingerprint(manager: str, mtime: int, size: int) -> str:
+    """Return the package database fingerprint in the format the probe prints."""
+    return f"{manager}:{mtime}:{size}"
+
+
+def parse_package_db(manager: str, text: str) -> list[str]:
+    """Return installed package names from a raw opkg status or apk DB file.
+
+    Mirrors the awk/sed used by the probe script for transports that read
+    the database file directly.
+    """
+    packages: list[str] = []
+    if manager == "apk":
+        return [line[2:] for line in text.splitlines() if line.startswith("P:")]
+    name = None
+    for line in text.splitlines():
+        if line.startswith("Package:"):
+            name = line.split(":", 1)[1].strip()
+        elif line.startswith("Status:") and line.endswith(" installed") and name:
+            packages.append(name)
+    return packages
+
+
+def first_line(text: str | None) -> str | None:
+    """Return the first non-empty line from text, or None."""
+    for line in (text or "").splitlines():
+        if s := line.strip():
+            return s
+    return None
+
+
+def build_device_probe(
+    sections: dict[str, ProbeSection], previous: DeviceProbe | None = None
+) -> DeviceProbe:
+    """Build a DeviceProbe from parsed sections, keeping whatever succeeded.
+
+    Skipped sections are filled from `previous`.
+    """
+    probe = DeviceProbe(online=True)
+
+    probe.boot_id = first_line(sections["boot"].body if "boot" in sections else None)
+
+    probe.firmware_file = first_line(
+        sections["firmware"].body if "firmware" in sections else None
+    )
+
+    board = sections.get("board")
+    if board is not None and board.skipped and previous is not None:
+        probe.board = previous.board
+        probe.board_cached = True
+    elif (failure := _section_failure(board)) is None:
+        try:
+            probe.board = board_info_from_ubus(json.loads(board.body))
+        except (json.JSONDecodeError, AttributeError) as err:
+            probe.errors["board"] = f"invalid board JSON: {err}"
+    else:
+        probe.errors["board"] = failure
+
+    sysinfo = sections.get("sysinfo")
+    if (failure := _section_failure(sysinfo)) is None:
+        wan = sections.get("wan")
+        try:
+            probe.system = system_info_from_ubus(
+                json.loads(sysinfo.body),
+                json.loads(wan.body) if wan is not None and wan.ok else None,
+            )
+        except (json.JSONDecodeError, AttributeError, TypeError) as err:
+            probe.errors["sysinfo"] = f"invalid system info JSON: {err}"
+    else:
+        probe.errors["sysinfo"] = failure
+
+    probe.package_fingerprint = first_line(
+        sections["pkgdb"].body if "pkgdb" in sections else None
+    )
+
+    packages = sections.get("packages")
+    if packages is not None and packages.skipped and previous is not None:
+        # Share the previous set; nothing is transferred or re-parsed
+        probe.packages = previous.packages
+        probe.packages_cached = True
+    elif packages is not None and packages.body:
+        probe.packages = intern_packages(
+            line.strip() for line in packages.body.splitlines() if line.strip()
+        )
+    if (failure := _section_failure(packages)) is not None:
+        probe.errors["packages"] = failure
+
+    return probe
@@ -0,0 +1,216 @@
+"""Router-side push agent and the Home Assistant webhook it posts to.
+
+The agent is a procd service running the regular probe script (see
+`probe.py`) in a loop. It POSTs the framed probe output to a per-place
+webhook when it changes (runtime telemetry aside), and at least every
+heartbeat so Home Assistant can tell a quiet router from a dead agent.
+Sections already delivered are sent as skip markers; when Home Assistant
+cannot apply them (e.g. after a restart) it answers 409 and the agent
+resends everything.
+"""
+
+from __future__ import annotations
+
+import hmac
+import logging
+import secrets
+import shlex
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+from homeassistant.components import webhook
+
+from .const import DOMAIN
+from .probe import build_probe_body
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .ssh_client import OpenWRTSSH
+
+_LOGGER = logging.getLogger(__name__)
+
+AGENT_NAME = "owrt-ha-agent"
+AGENT_PATH = f"/usr/bin/{AGENT_NAME}"
+AGENT_INIT_PATH = f"/etc/init.d/{AGENT_NAME}"
+# Seconds between probes on the router
+AGENT_INTERVAL_SECONDS = 30
+# Unchanged state is still posted this often
+AGENT_HEARTBEAT_SECONDS = 300
+# Pushes younger than this replace SSH polling
+PUSH_FRESHNESS_SECONDS = 3 * AGENT_HEARTBEAT_SECONDS
+# Place entry data keys: random webhook id, and per-device agent tokens by IP
+WEBHOOK_ID_KEY = "webhook_id"
+PUSH_TOKENS_KEY = "push_tokens"
+
+_INIT_SCRIPT = f"""\
+#!/bin/sh /etc/rc.common
+# Installed by the OpenWRT Updater Home Assistant integration
+START=99
+USE_PROCD=1
+
+start_service() {{
+	procd_open_instance
+	procd_set_param command {AGENT_PATH}
+	procd_set_param respawn
+	procd_close_instance
+}}
+"""
+
+# Uses curl when present, otherwise uclient-fetch from the base system
+_AGENT_LOOP = """\
+_post() {
+	if command -v curl >/dev/null 2>&1; then
+		curl -fsS -m 10 -o /dev/null --data-binary "@$DOC" "$URL"
+	else
+		uclient-fetch -q -T 10 -O /dev/null --post-file="$DOC" "$URL"
+	fi
+}
+while :; do
+	{
+		_probe
+	} >"$DOC" 2>/dev/null
+	# Telemetry changes every probe; it rides along but does not trigger a post.
+	# Of the wan status (uptime, lease times) only the addresses count.
+	_new=$(sed -e '/^@@owrt begin sysinfo$/,/^@@owrt end sysinfo /d' \
+		-e '/^@@owrt begin wan$/,/^@@owrt end wan /{/"address"/!d}' "$DOC" | md5sum)
+	_now=$(date +%s)
+	if [ "$_new" != "$_hash" ] || [ $((_now - _sent)) -ge "$HEARTBEAT" ]; then
+		if _post; then
+			_hash=$_new
+			_sent=$_now
+			KNOWN_BOOT_ID=
+			KNOWN_PKG_FP=
+			grep -q "^@@owrt error board" "$DOC" || KNOWN_BOOT_ID=$_boot
+			grep -q "^@@owrt error packages" "$DOC" || KNOWN_PKG_FP=$_pkgfp
+		else
+			# Rejected or not delivered: send every section next time
+			KNOWN_BOOT_ID=
+			KNOWN_PKG_FP=
+			_hash=
+		fi
+	fi
+	sleep "$INTERVAL"
+done
+"""
+
+
+def async_ensure_webhook_id(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Generate the random webhook id of a place entry once.
+
+    Must run before the entry's update listener is added, or storing the id
+    would reload the entry.
+    """
+    if WEBHOOK_ID_KEY not in entry.data:
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, WEBHOOK_ID_KEY: secrets.token_hex(32)}
+        )
+
+
+def webhook_id_for(entry: ConfigEntry) -> str:
+    """Return the webhook id of a place entry."""
+    return entry.data[WEBHOOK_ID_KEY]
+
+
+def push_token_for(entry: ConfigEntry, ip: str) -> str | None:
+    """Return the secret a device's agent proves its identity with.
+
+    Every router of a place shares the webhook id, so the token binds a
+    push to one device: a router cannot post state for another one.
+    """
+    return entry.data.get(PUSH_TOKENS_KEY, {}).get(ip)
+
+
+def new_push_token() -> str:
+    """Return a fresh random agent token."""
+    return secrets.token_hex(32)
+
+
+def async_save_push_token(
+    hass: HomeAssistant, entry: ConfigEntry, ip: str, token: str
+) -> None:
+    """Store the token of a newly installed agent, replacing the old one."""
+    tokens = {**entry.data.get(PUSH_TOKENS_KEY, {}), ip: token}
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, PUSH_TOKENS_KEY: tokens}
+    )
+
+
+def build_agent_script(url: str) -> str:
+    """Return the agent shell script posting to `url`."""
+    probe = build_probe_body().replace("\n", "\n\t").rstrip("\t")
+    return (
+        "#!/bin/sh\n"
+        "# Installed by the OpenWRT Updater Home Assistant integration\n"
+        f"URL={shlex.quote(url)}\n"
+        f"INTERVAL={AGENT_INTERVAL_SECONDS}\n"
+        f"HEARTBEAT={AGENT_HEARTBEAT_SECONDS}\n"
+        f"DOC=/tmp/{AGENT_NAME}.doc\n"
+        "KNOWN_BOOT_ID=\n"
+        "KNOWN_PKG_FP=\n"
+        "_hash=\n"
+        "_sent=0\n"
+        f"_probe() {{\n\t{probe}}}\n"
+        f"{_AGENT_LOOP}"
+    )
+
+
+def build_install_command(url: str) -> str:
+    """Return a shell command installing, enabling and (re)starting the agent."""
+    return (
+        f"cat >{AGENT_PATH} <<'OWRT_EOF'\n{build_agent_script(url)}OWRT_EOF\n"
+        f"chmod 755 {AGENT_PATH}\n"
+        f"cat >{AGENT_INIT_PATH} <<'OWRT_EOF'\n{_INIT_SCRIPT}OWRT_EOF\n"
+        f"chmod 755 {AGENT_INIT_PATH}\n"
+        f"{AGENT_INIT_PATH} enable && {AGENT_INIT_PATH} restart"
+    )
+
+
+def agent_url(hass: HomeAssistant, entry: ConfigEntry, ip: str, token: str) -> str:
+    """Return the webhook URL a router posts to, preferring the local address."""
+    url = webhook.async_generate_url(
+        hass, webhook_id_for(entry), allow_external=False, prefer_external=False
+    )
+    return f"{url}?ip={ip}&token={token}"
+
+
+async def async_install_agent(client: OpenWRTSSH, url: str) -> bool:
+    """Install the push agent over an open SSH client."""
+    result = await client.exec_command(build_install_command(url), timeout=30)
+    return result is not None and result.exit_status == 0
+
+
+def async_register_webhook(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Accept agent pushes for a place entry until it unloads."""
+    webhook_id = webhook_id_for(entry)
+
+    async def _async_handle(
+        hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response:
+        """Hand a pushed probe document to the device coordinator."""
+        ip = request.query.get("ip", "")
+        token = request.query.get("token", "")
+        expected = push_token_for(entry, ip)
+        if expected is None or not hmac.compare_digest(token, expected):
+            _LOGGER.warning("Rejected push for %s from %s", ip, request.remote)
+            return web.Response(status=403)
+        device = hass.data[DOMAIN].get(entry.entry_id, {}).get(ip)
+        coordinator = device and device.get("coordinator")
+        if coordinator is None or not coordinator.accepts_push:
+            _LOGGER.debug("Ignoring push for unknown device %s", ip)
+            return web.Response(status=404)
+        if not coordinator.async_handle_push(await request.text()):
+            return web.Response(status=409)
+        return web.Response(status=200)
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"OpenWRT {entry.data.get('place_name', entry.title)}",
+        webhook_id,
+        _async_handle,
+        local_only=True,
+    )
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
@@ -0,0 +1,171 @@
+"""Staggered poll schedule: deterministic per-device phase plus jitter.
+
+Each key (device IP, place name) gets a fixed phase within the poll
+interval, derived from a hash of the key and anchored to wall-clock time.
+Polls therefore spread evenly over the interval and keep the same spread
+across restarts and reloads. A little random jitter on top prevents
+devices whose phases happen to collide from staying in lockstep.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+import hashlib
+import logging
+import random
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+# Random jitter applied to each poll, as a fraction of the interval (+/-)
+JITTER_FRACTION = 0.05
+# Consecutive offline polls that open the circuit breaker
+BREAKER_THRESHOLD = 3
+# Shortest adaptive interval, as a fraction of the base interval
+FAST_FACTOR = 0.25
+# Growth of the interval per unchanged poll
+BACKOFF_GROWTH = 1.5
+# Shortest adaptive interval in seconds, whatever the base
+MIN_INTERVAL_SECONDS = 60.0
+
+
+def poll_phase(key: str, interval: float) -> float:
+    """Return the fixed offset of `key` within an interval, in seconds."""
+    digest = hashlib.sha256(key.encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64 * interval
+
+
+def next_poll_delay(
+    key: str,
+    interval: float,
+    *,
+    now: float | None = None,
+    min_delay: float = 0.0,
+    jitter: float = JITTER_FRACTION,
+) -> float:
+    """Return seconds until the next phase slot of `key` after `min_delay`.
+
+    Slots are `phase + k * interval` in Unix time. `min_delay` keeps a poll
+    that fired early because of jitter from being followed by another one
+    right away.
+    """
+    now = time.time() if now is None else now
+    earliest = now + min_delay
+    slot = earliest + (poll_phase(key, interval) - earliest) % interval
+    offset = random.uniform(-jitter, jitter) * interval
+    return max(slot - now + offset, 0.0)
+
+
+@dataclass(slots=True)
+class AdaptivePollPolicy:
+    """Per-device poll interval that follows how active the device is.
+
+    - A change in the snapshot drops the interval to FAST_FACTOR * base.
+    - Each unchanged poll grows it by BACKOFF_GROWTH, up to `maximum`.
+    - While an update is pending the interval stays at FAST_FACTOR * base,
+      so the device is polled faster than an idle one.
+    - BREAKER_THRESHOLD offline polls in a row open the circuit breaker:
+      the device is then only checked with a TCP probe at the base interval
+      until it answers again.
+    """
+
+    base: float
+    maximum: float
+    interval: float = 0.0
+    failures: int = 0
+
+    def __post_init__(self) -> None:
+        """Start at the base interval."""
+        self.maximum = max(self.maximum, self.base)
+        self.interval = self.interval or self.base
+
+    @property
+    def breaker_open(self) -> bool:
+        """Return whether full polls are suspended for an offline device."""
+        return self.failures >= BREAKER_THRESHOLD
+
+    def record(self, online: bool, changed: bool, pending: bool) -> float:
+        """Record a poll result and return the next interval in seconds."""
+        if not online:
+            self.failures += 1
+            self.interval = self.base
+            return self.interval
+        self.failures = 0
+        if changed:
+            self.interval = max(self.base * FAST_FACTOR, MIN_INTERVAL_SECONDS)
+        else:
+            ceiling = self.base * FAST_FACTOR if pending else self.maximum
+            self.interval = min(self.interval * BACKOFF_GROWTH, ceiling)
+        self.interval = min(max(self.interval, MIN_INTERVAL_SECONDS), self.maximum)
+        return self.interval
+
+
+class PhasedTimer:
+    """Run an async action on the staggered schedule of one key."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        key: str,
+        interval: timedelta,
+        action: Callable[[], Awaitable[object]],
+    ) -> None:
+        """Initialize the timer; call `start()` to arm it."""
+        self.hass = hass
+        self.key = key
+        self.interval = interval
+        self._action = action
+        self._unsub: CALLBACK_TYPE | None = None
+        self._running = False
+        self.next_run: float | None = None
+
+    def start(self) -> None:
+        """Arm the timer for the next phase slot."""
+        self._running = True
+        self._schedule(0.0)
+
+    def stop(self) -> None:
+        """Cancel the pending run."""
+        self._running = False
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self.next_run = None
+
+    def set_interval(self, interval: timedelta) -> None:
+        """Change the interval and re-arm on the new schedule.
+
+        The next run is at least half the new interval away, so shortening
+        the interval right after a poll does not trigger another one at once.
+        """
+        if interval == self.interval:
+            return
+        self.interval = interval
+        # While the action runs, re-arming is left to _async_fire
+        if self._running and self._unsub is not None:
+            self._unsub()
+            self._schedule(interval.total_seconds() / 2)
+
+    def _schedule(self, min_delay: float) -> None:
+        """Arm the timer for the first slot after `min_delay` seconds."""
+        delay = next_poll_delay(
+            self.key, self.interval.total_seconds(), min_delay=min_delay
+        )
+        self.next_run = time.time() + delay
+        self._unsub = async_call_later(self.hass, delay, self._async_fire)
+
+    async def _async_fire(self, _now) -> None:
+        """Run the action and re-arm for the following slot."""
+        self._unsub = None
+        try:
+            await self._action()
+        except Exception:
+            _LOGGER.exception("Scheduled poll of %s failed", self.key)
+        finally:
+            if self._running and self._unsub is None:
+                self._schedule(self.interval.total_seconds() / 2)
@@ -0,0 +1,109 @@
+"""Fleet-wide cap on concurrent SSH sessions with priority classes.
+
+Every pooled `OpenWRTSSH` session takes a slot for as long as it is open.
+When all slots are busy, waiters are served lowest priority value first and
+in arrival order within a class, so user actions overtake queued polls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import time
+
+from .latency import QuantileSketch
+
+# Priority classes, lower is served first
+PRIORITY_USER = 0
+PRIORITY_POLL = 1
+PRIORITY_NAMES = {PRIORITY_USER: "user", PRIORITY_POLL: "poll"}
+
+DEFAULT_CONCURRENCY = 10
+
+
+@dataclass(slots=True)
+class _WaitStats:
+    """Queue wait times of one priority class."""
+
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    samples: int = 0
+    queued: int = 0
+    max_wait: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record how long a slot request waited."""
+        self.sketch.add(seconds)
+        self.samples += 1
+        self.max_wait = max(self.max_wait, seconds)
+
+
+class SSHScheduler:
+    """Priority semaphore bounding how many SSH sessions run at once."""
+
+    def __init__(self, limit: int = DEFAULT_CONCURRENCY) -> None:
+        """Initialize with a concurrency limit."""
+        self.limit = max(1, limit)
+        self.active = 0
+        # Heap of (priority, sequence, future); cancelled futures are skipped
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._stats = {priority: _WaitStats() for priority in PRIORITY_NAMES}
+
+    def configure(self, limit: int) -> None:
+        """Change the concurrency limit; a raised limit admits waiters now."""
+        self.limit = max(1, limit)
+        self._wake()
+
+    async def acquire(self, priority: int = PRIORITY_POLL) -> None:
+        """Wait for a slot. Every acquire must be paired with `release()`."""
+        stats = self._stats.setdefault(priority, _WaitStats())
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            stats.record(0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        stats.queued += 1
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over just before the cancellation landed
+                self.release()
+            raise
+        finally:
+            stats.queued -= 1
+        stats.record(time.monotonic() - started)
+
+    def release(self) -> None:
+        """Free a slot and hand it to the most urgent waiter."""
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Admit waiters while slots are free."""
+        while self._waiters and self.active < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.active += 1
+            future.set_result(None)
+
+    def diagnostics(self) -> dict:
+        """Return limit, usage, queue depth and wait times per class."""
+        classes = {}
+        for priority, stats in sorted(self._stats.items()):
+            p50 = stats.sketch.quantile(0.5)
+            p99 = stats.sketch.quantile(0.99)
+            classes[PRIORITY_NAMES.get(priority, str(priority))] = {
+                "queued": stats.queued,
+                "acquired": stats.samples,
+                "wait_p50": None if p50 is None else round(p50, 3),
+                "wait_p99": None if p99 is None else round(p99, 3),
+                "wait_max": round(stats.max_wait, 3),
+            }
+        return {"limit": self.limit, "active": self.active, "classes": classes}
@@ -0,0 +1,58 @@
+"""Persisted last good snapshot of every device, for a warm start.
+
+After a restart, device coordinators serve the stored snapshot marked stale
+right away and refresh it in the background, so entities do not wait for
+slow or unreachable routers.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.snapshots"
+# Polls within this many seconds are written together
+SAVE_DELAY_SECONDS = 60.0
+
+
+class SnapshotStore:
+    """Keep the last online snapshot per device IP in an HA Store."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty store; call `async_load()` before use."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._snapshots: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load persisted snapshots; a missing or broken file starts empty."""
+        try:
+            self._snapshots = await self._store.async_load() or {}
+        except Exception:
+            _LOGGER.warning("Could not load device snapshots", exc_info=True)
+            self._snapshots = {}
+
+    def get(self, ip: str) -> dict[str, Any] | None:
+        """Return the stored snapshot of `ip`, if any."""
+        return self._snapshots.get(ip)
+
+    def save(self, ip: str, snapshot: dict[str, Any]) -> None:
+        """Remember an online snapshot and schedule a delayed write."""
+        if self._snapshots.get(ip) == snapshot:
+            return
+        self._snapshots[ip] = snapshot
+        self._store.async_delay_save(lambda: self._snapshots, SAVE_DELAY_SECONDS)
+
+    def remove(self, ip: str) -> None:
+        """Forget a device that was removed from its place."""
+        if self._snapshots.pop(ip, None) is not None:
+            self._store.async_delay_save(lambda: self._snapshots, SAVE_DELAY_SECONDS)
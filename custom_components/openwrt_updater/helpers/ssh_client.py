@@ -1,16 +1,409 @@
 """SSH utils."""
 
 import asyncio
-import json
+from collections.abc import AsyncIterator, Callable
+import contextlib
+from dataclasses import dataclass, field
 import logging
 from pathlib import Path
 import shlex
+import time
 
 import asyncssh
 
+from .latency import LatencyTracker
+from .probe import (
+    build_device_probe,
+    build_probe_script,
+    first_line,
+    parse_probe_output,
+)
+from .scheduler import PRIORITY_POLL, SSHScheduler
+from .types import CommandOutcome, DeviceProbe
+
 _LOGGER = logging.getLogger(__name__)
 logging.getLogger("asyncssh").setLevel(logging.WARNING)
 
+# Errors meaning the pooled transport is gone and a fresh handshake is needed
+_CONNECTION_LOST_ERRORS = (
+    asyncssh.ConnectionLost,
+    asyncssh.DisconnectError,
+    asyncssh.ChannelOpenError,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+# Parsed private keys keyed by path: (mtime, key)
+_KEY_CACHE: dict[str, tuple[float, asyncssh.SSHKey]] = {}
+
+# Timeouts used until enough latency history is collected, per operation kind
+DEFAULT_TIMEOUTS: dict[str, float] = {
+    "connect": 5.0,
+    "probe": 10.0,
+    "command": 5.0,
+}
+# (min, max) clamp for learned timeouts unless configured otherwise
+DEFAULT_TIMEOUT_BOUNDS = (2.0, 60.0)
+
+# Idle connections are kept at least this long, and this much longer than
+# the longest gap between two polls
+DEFAULT_IDLE_TIMEOUT = 300.0
+_IDLE_GRACE_SECONDS = 60.0
+
+# Concurrent channels allowed on one connection; small routers run dropbear
+MAX_CHANNELS_PER_CONNECTION = 4
+# Seconds between SIGTERM and SIGKILL for a timed-out remote command
+TERMINATE_GRACE_SECONDS = 3
+
+_PID_MARKER = "@@owrt pid"
+# Printed by wrappers of disruptive commands with the real exit status
+EXIT_MARKER = "@@owrt exit"
+# Output lines kept in CommandOutcome.lines
+_OUTCOME_TAIL_LINES = 50
+
+# Kills a remote process tree: SIGTERM, wait up to GRACE seconds, SIGKILL,
+# then prints one "leaked <pid>" line per process that is still alive
+# (zombies count as terminated)
+_TERMINATE_SCRIPT = """\
+_tree() {{
+	echo "$1"
+	for _c in $(grep -l "^PPid:[[:space:]]*$1\\$" /proc/[0-9]*/status 2>/dev/null \\
+		| cut -d/ -f3); do
+		_tree "$_c"
+	done
+}}
+_alive() {{
+	for _p in "$@"; do
+		[ -e "/proc/$_p" ] && ! grep -qs "^State:[[:space:]]*Z" "/proc/$_p/status" \\
+			&& echo "$_p"
+	done
+}}
+_pids=$(_tree {pid})
+kill -TERM $_pids 2>/dev/null
+_i=0
+while [ "$_i" -lt {grace} ]; do
+	[ -z "$(_alive $_pids)" ] && exit 0
+	sleep 1
+	_i=$((_i + 1))
+done
+_pids=$(_alive $_pids)
+kill -KILL $_pids 2>/dev/null
+sleep 1
+for _p in $(_alive $_pids); do echo "leaked $_p"; done
+"""
+
+# Detached termination tasks started on cancellation
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
+
+
+def _read_key_if_changed(
+    key_path: str, cached_mtime: float | None
+) -> tuple[float, str | None] | None:
+    """Return (mtime, text) for a key file; text is None if mtime is unchanged.
+
+    Runs in an executor thread. Returns None if the file does not exist.
+    """
+    key_file = Path(key_path)
+    try:
+        mtime = key_file.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    if cached_mtime is not None and mtime == cached_mtime:
+        return mtime, None
+    return mtime, key_file.read_text()
+
+
+async def async_load_client_keys(key_path: str) -> list | None:
+    """Return client keys for asyncssh, parsing the key file only when it changes.
+
+    Returns None if the key file is missing so asyncssh falls back to
+    agent/default keys.
+    """
+    cached = _KEY_CACHE.get(key_path)
+    loaded = await asyncio.to_thread(
+        _read_key_if_changed, key_path, cached[0] if cached else None
+    )
+    if loaded is None:
+        _KEY_CACHE.pop(key_path, None)
+        _LOGGER.warning("SSH key not found at %s; attempting agent/defaults", key_path)
+        return None
+
+    mtime, key_text = loaded
+    if key_text is None and cached is not None:
+        return [cached[1]]
+
+    private_key = asyncssh.import_private_key(key_text)
+    _KEY_CACHE[key_path] = (mtime, private_key)
+    _LOGGER.debug("Loaded SSH key from %s", key_path)
+    return [private_key]
+
+
+# (username, host, agent_forwarding, (jump_username, jump_host) or None)
+_PoolKey = tuple[str, str, bool, tuple[str, str] | None]
+
+
+@dataclass(slots=True)
+class _PooledConnection:
+    """Pool bookkeeping for one shared SSH connection."""
+
+    key: _PoolKey
+    conn: asyncssh.SSHClientConnection | None = None
+    # Borrowed jump host connection this one is tunneled through
+    tunnel: asyncssh.SSHClientConnection | None = None
+    users: int = 0
+    alive: bool = True
+    last_used: float = field(default_factory=time.monotonic)
+    channels: asyncio.Semaphore = field(
+        default_factory=lambda: asyncio.Semaphore(MAX_CHANNELS_PER_CONNECTION)
+    )
+
+
+class _PoolClient(asyncssh.SSHClient):
+    """asyncssh client callbacks marking a pooled connection as dead."""
+
+    def __init__(self, entry: _PooledConnection) -> None:
+        """Bind callbacks to a pool entry."""
+        self._entry = entry
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Mark the pooled connection as unusable."""
+        self._entry.alive = False
+
+
+class SSHConnectionPool:
+    """Per-host pool of keep-alive SSH connections.
+
+    One connection is kept per (username, host, agent_forwarding, jump) and
+    shared between concurrent users, since SSH multiplexes channels over it.
+    Connections through a jump host are tunneled inside one pooled
+    connection to that host, so many devices share a single upstream
+    handshake.
+    Connections unused for `idle_timeout` seconds are closed by a background
+    reaper; dead connections are replaced on the next acquire.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        keepalive_interval: float = 30.0,
+        keepalive_count_max: int = 3,
+    ) -> None:
+        """Initialize an empty pool."""
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count_max = keepalive_count_max
+        self._entries: dict[_PoolKey, _PooledConnection] = {}
+        # Dead entries replaced while still borrowed; closed on last release
+        self._retired: list[_PooledConnection] = []
+        self._locks: dict[_PoolKey, asyncio.Lock] = {}
+        self._reaper: asyncio.Task | None = None
+        self._closed = False
+        # Remote processes that survived SIGKILL, per host
+        self.leaked_processes: dict[str, int] = {}
+        self.timeout_bounds = DEFAULT_TIMEOUT_BOUNDS
+        self._latency: dict[str, LatencyTracker] = {}
+        # Fleet-wide session cap shared by every client using this pool
+        self.scheduler = SSHScheduler()
+
+    def configure_timeouts(self, lower: float, upper: float) -> None:
+        """Set the (min, max) bounds for learned timeouts."""
+        self.timeout_bounds = (min(lower, upper), max(lower, upper))
+
+    def configure_idle_timeout(self, poll_interval: float, jitter: float = 0.0) -> None:
+        """Keep idle connections open across the longest gap between two polls.
+
+        `jitter` is the +/- fraction of the interval a poll may be shifted
+        by. A shorter idle timeout would let the reaper close the connection
+        right before the next poll needs it.
+        """
+        self.idle_timeout = max(
+            DEFAULT_IDLE_TIMEOUT,
+            poll_interval * (1 + 2 * jitter) + _IDLE_GRACE_SECONDS,
+        )
+
+    def latency(self, host: str) -> LatencyTracker:
+        """Return the latency history of a host, kept across connections."""
+        return self._latency.setdefault(host, LatencyTracker())
+
+    def diagnostics(self) -> dict:
+        """Return pool state and learned timeouts per host."""
+        hosts: dict[str, dict] = {
+            host: {"latency": tracker.as_dict(DEFAULT_TIMEOUTS, self.timeout_bounds)}
+            for host, tracker in self._latency.items()
+        }
+        for (username, host, _, jump), entry in self._entries.items():
+            hosts.setdefault(host, {})["connection"] = {
+                "username": username,
+                "jump": "@".join(jump) if jump else None,
+                "alive": entry.alive,
+                "users": entry.users,
+                "idle_seconds": round(time.monotonic() - entry.last_used, 1),
+            }
+        for host, leaked in self.leaked_processes.items():
+            hosts.setdefault(host, {})["leaked_processes"] = leaked
+        return {
+            "timeout_bounds": list(self.timeout_bounds),
+            "scheduler": self.scheduler.diagnostics(),
+            "hosts": hosts,
+        }
+
+    async def acquire(
+        self,
+        host: str,
+        username: str,
+        key_path: str,
+        *,
+        connect_timeout: float,
+        agent_forwarding: bool = False,
+        jump: tuple[str, str] | None = None,
+    ) -> asyncssh.SSHClientConnection:
+        """Borrow a connection to host, connecting or reconnecting if needed.
+
+        With `jump` as (username, host), the connection is tunneled through
+        the pooled connection to that jump host. Every successful acquire
+        must be paired with `release()`.
+        """
+        if self._closed:
+            raise RuntimeError("SSH connection pool is closed")
+
+        key = (username, host, agent_forwarding, jump)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            entry = self._entries.get(key)
+            if entry is None or not entry.alive or entry.conn is None:
+                if entry is not None:
+                    self._retire(entry)
+                entry = _PooledConnection(key=key)
+                client_keys = await async_load_client_keys(key_path)
+                if jump is not None:
+                    entry.tunnel = await self.acquire(
+                        jump[1], jump[0], key_path, connect_timeout=connect_timeout
+                    )
+                started = time.monotonic()
+                try:
+                    entry.conn = await asyncssh.connect(
+                        host=host,
+                        username=username,
+                        client_keys=client_keys,
+                        known_hosts=None,
+                        connect_timeout=connect_timeout,
+                        agent_forwarding=agent_forwarding,
+                        keepalive_interval=self.keepalive_interval,
+                        keepalive_count_max=self.keepalive_count_max,
+                        client_factory=lambda: _PoolClient(entry),
+                        tunnel=entry.tunnel,
+                    )
+                except BaseException as err:
+                    if entry.tunnel is not None:
+                        self.release(entry.tunnel)
+                    if isinstance(err, TimeoutError):
+                        self.latency(host).record_timeout("connect")
+                    raise
+                self.latency(host).record("connect", time.monotonic() - started)
+                self._entries[key] = entry
+                _LOGGER.debug(
+                    "Pooled new SSH connection to %s@%s%s",
+                    username,
+                    host,
+                    f" via {jump[0]}@{jump[1]}" if jump else "",
+                )
+
+            entry.users += 1
+            entry.last_used = time.monotonic()
+
+        self._ensure_reaper()
+        return entry.conn
+
+    def release(self, conn: asyncssh.SSHClientConnection) -> None:
+        """Return a borrowed connection to the pool."""
+        if (entry := self._find(conn)) is None:
+            return
+        entry.users = max(0, entry.users - 1)
+        entry.last_used = time.monotonic()
+        if not entry.alive and entry.users == 0:
+            self._discard(entry)
+
+    def channel_slots(self, conn: asyncssh.SSHClientConnection) -> asyncio.Semaphore:
+        """Return the semaphore capping concurrent channels on a connection."""
+        if (entry := self._find(conn)) is not None:
+            return entry.channels
+        return asyncio.Semaphore(MAX_CHANNELS_PER_CONNECTION)
+
+    def _find(self, conn: asyncssh.SSHClientConnection) -> _PooledConnection | None:
+        """Return the pooled or retired entry holding a connection."""
+        for entry in (*self._entries.values(), *self._retired):
+            if entry.conn is conn:
+                return entry
+        return None
+
+    def record_leaked(self, host: str, count: int) -> None:
+        """Account remote processes that could not be terminated."""
+        self.leaked_processes[host] = self.leaked_processes.get(host, 0) + count
+
+    def invalidate(self, conn: asyncssh.SSHClientConnection) -> None:
+        """Mark a connection as broken so the next acquire reconnects."""
+        if (entry := self._find(conn)) is not None:
+            entry.alive = False
+
+    def _retire(self, entry: _PooledConnection) -> None:
+        """Drop a dead entry from the pool, closing it once nobody borrows it."""
+        if not entry.users:
+            self._discard(entry)
+            return
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+        self._retired.append(entry)
+
+    def _discard(self, entry: _PooledConnection) -> None:
+        """Drop an entry from the pool and close its connection."""
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+        self._retired = [other for other in self._retired if other is not entry]
+        if entry.conn is not None:
+            entry.conn.close()
+            entry.conn = None
+        if entry.tunnel is not None:
+            self.release(entry.tunnel)
+            entry.tunnel = None
+
+    def _ensure_reaper(self) -> None:
+        """Start the idle reaper task if it is not running."""
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(
+                self._reap_idle(), name="openwrt_updater-ssh-pool-reaper"
+            )
+
+    async def _reap_idle(self) -> None:
+        """Periodically close idle and dead connections."""
+        while self._entries:
+            await asyncio.sleep(self.idle_timeout / 2)
+            self.evict_idle()
+
+    def evict_idle(self) -> None:
+        """Close connections that are dead or idle longer than idle_timeout."""
+        now = time.monotonic()
+        for entry in list(self._entries.values()):
+            if entry.users:
+                continue
+            if not entry.alive or now - entry.last_used > self.idle_timeout:
+                _LOGGER.debug("Evicting idle SSH connection %s@%s", *entry.key[:2])
+                self._discard(entry)
+
+    async def async_close(self) -> None:
+        """Close all pooled connections and stop the reaper."""
+        self._closed = True
+        if self._reaper is not None:
+            self._reaper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reaper
+            self._reaper = None
+        entries = [*self._entries.values(), *self._retired]
+        conns = [e.conn for e in entries if e.conn is not None]
+        for entry in entries:
+            self._discard(entry)
+        for conn in conns:
+            with contextlib.suppress(Exception):
+                await conn.wait_closed()
+
 
 class OpenWRTSSH:
     """Async SSH client wrapper around asyncssh with small convenience helpers.
@@ -18,6 +411,11 @@ class OpenWRTSSH:
     Usage:
         Call the high-level method:
         data = await OpenWRTSSHClient("10.0.0.1").async_get_device_info()
+
+    If a `SSHConnectionPool` is given, the connection is borrowed from it on
+    enter and returned on exit instead of being opened and closed, and the
+    session waits for a slot of the pool's scheduler at `priority` first
+    (None skips the scheduler, for long-lived streams).
     """
 
     def __init__(
@@ -25,28 +423,71 @@ class OpenWRTSSH:
         ip: str,
         key_path: str,
         username: str = "root",
-        connect_timeout: float = 5.0,
-        command_timeout: float | None = 5.0,
+        connect_timeout: float | None = None,
+        command_timeout: float | None = None,
         agent_forwarding: bool = False,
+        pool: SSHConnectionPool | None = None,
+        jump: tuple[str, str] | None = None,
+        priority: int | None = PRIORITY_POLL,
     ) -> None:
-        """Initialize wrapper."""
+        """Initialize wrapper.
+
+        Timeouts left as None are derived from the device latency history
+        (see `latency.py`), kept in the pool across connections. `jump` is a
+        (username, host) pair to tunnel the connection through.
+        """
         self.ip = ip
         self.key_path = key_path
         self.username = username
         self.connect_timeout = connect_timeout
         self.command_timeout = command_timeout
         self.agent_forwarding = agent_forwarding
+        self.pool = pool
+        self.jump = jump
+        self.priority = priority
+        self._scheduled = False
+        self._jump_conn: asyncssh.SSHClientConnection | None = None
         self.conn: asyncssh.SSHClientConnection | None = None
         self.available = False
+        self.leaked_processes = 0
+        self._channels = asyncio.Semaphore(MAX_CHANNELS_PER_CONNECTION)
+        if pool is not None:
+            self.latency = pool.latency(ip)
+            self.timeout_bounds = pool.timeout_bounds
+        else:
+            self.latency = LatencyTracker()
+            self.timeout_bounds = DEFAULT_TIMEOUT_BOUNDS
+
+    def _timeout(self, kind: str) -> float:
+        """Return the learned timeout for an operation kind."""
+        return self.latency.timeout_for(
+            kind, DEFAULT_TIMEOUTS[kind], self.timeout_bounds
+        )
 
     async def __aenter__(self) -> "OpenWRTSSH":
-        """Open SSH connection when entering async context."""
-        await self.connect()
+        """Take a scheduler slot and open SSH connection when entering context."""
+        if self.pool is not None and self.priority is not None and not self._scheduled:
+            await self.pool.scheduler.acquire(self.priority)
+            self._scheduled = True
+        try:
+            await self.connect()
+        except BaseException:
+            self._release_slot()
+            raise
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
-        """Close SSH connection when leaving async context."""
-        await self.close()
+        """Close SSH connection and free the scheduler slot."""
+        try:
+            await self.close()
+        finally:
+            self._release_slot()
+
+    def _release_slot(self) -> None:
+        """Return the scheduler slot taken on enter, if any."""
+        if self._scheduled:
+            self._scheduled = False
+            self.pool.scheduler.release()
 
     async def connect(self) -> bool:
         """Establish SSH connection if it is not already open.
@@ -63,29 +504,45 @@ class OpenWRTSSH:
         if self.conn is not None:
             return True
 
-        client_keys: list | None = None
-        key_file = Path(self.key_path)
-        if key_file.exists():
-            key_text = await asyncio.to_thread(Path(self.key_path).read_text)
-            private_key = asyncssh.import_private_key(key_text)
-            client_keys = [private_key]
-        else:
-            _LOGGER.warning(
-                "SSH key not found at %s; attempting agent/defaults", self.key_path
-            )
+        connect_timeout = self.connect_timeout or self._timeout("connect")
         try:
-            self.conn = await asyncssh.connect(
-                host=self.ip,
-                username=self.username,
-                client_keys=client_keys,
-                known_hosts=None,
-                connect_timeout=self.connect_timeout,
-                agent_forwarding=self.agent_forwarding,
-            )
+            if self.pool is not None:
+                self.conn = await self.pool.acquire(
+                    self.ip,
+                    self.username,
+                    self.key_path,
+                    connect_timeout=connect_timeout,
+                    agent_forwarding=self.agent_forwarding,
+                    jump=self.jump,
+                )
+            else:
+                client_keys = await async_load_client_keys(self.key_path)
+                if self.jump is not None:
+                    self._jump_conn = await asyncssh.connect(
+                        host=self.jump[1],
+                        username=self.jump[0],
+                        client_keys=client_keys,
+                        known_hosts=None,
+                        connect_timeout=connect_timeout,
+                    )
+                started = time.monotonic()
+                self.conn = await asyncssh.connect(
+                    host=self.ip,
+                    username=self.username,
+                    client_keys=client_keys,
+                    known_hosts=None,
+                    connect_timeout=connect_timeout,
+                    agent_forwarding=self.agent_forwarding,
+                    tunnel=self._jump_conn,
+                )
+                self.latency.record("connect", time.monotonic() - started)
         except (TimeoutError, asyncssh.Error, OSError) as exc:
             _LOGGER.warning("SSH connect to %s failed: %s", self.ip, exc)
             self.conn = None
             self.available = False
+            if self._jump_conn is not None:
+                self._jump_conn.close()
+                self._jump_conn = None
             raise
         except Exception as err:
             self.available = False
@@ -95,13 +552,20 @@ class OpenWRTSSH:
         else:
             _LOGGER.debug("Successfully connected to %s@%s", self.username, self.ip)
             self.available = True
+            if self.pool is not None:
+                self._channels = self.pool.channel_slots(self.conn)
         return self.available
 
     async def exec_command(
-        self, command: str, timeout: float | None = None
+        self, command: str, timeout: float | None = None, kind: str = "command"
     ) -> asyncssh.SSHCompletedProcess | None:
         """Run a remote command with a hard timeout; never raises on non-zero exit.
 
+        The command runs as a tracked remote process: on timeout or
+        cancellation its process tree is terminated on the device. Without an
+        explicit timeout, the learned timeout for `kind` is used and the
+        measured latency is added to the history.
+
         Returns:
             asyncssh.SSHCompletedProcess on success or None if command failed.
 
@@ -115,13 +579,27 @@ class OpenWRTSSH:
             _LOGGER.debug("SSH client not available, skipping command: %s", command)
             return None
 
+        adaptive = timeout is None and self.command_timeout is None
+        if adaptive:
+            effective_timeout = self._timeout(kind)
+        else:
+            effective_timeout = self.command_timeout if timeout is None else timeout
+
         try:
             _LOGGER.debug("Executing SSH command on %s | %s", self.ip, command)
-            effective_timeout = self.command_timeout if timeout is None else timeout
-            result = await asyncio.wait_for(
-                self.conn.run(f"sh -c {shlex.quote(command)}"), effective_timeout
-            )
+            started = time.monotonic()
+            try:
+                result = await self._run_tracked(command, effective_timeout)
+            except _CONNECTION_LOST_ERRORS:
+                if self.pool is None:
+                    raise
+                # Pooled connection went stale between uses; reconnect once
+                _LOGGER.debug("Pooled SSH connection to %s lost, reconnecting", self.ip)
+                await self._reconnect()
+                result = await self._run_tracked(command, effective_timeout)
         except TimeoutError as err:
+            if adaptive:
+                self.latency.record_timeout(kind)
             _LOGGER.warning(
                 "SSH command timed out on %s: %s, %s", self.ip, command, err
             )
@@ -130,6 +608,8 @@ class OpenWRTSSH:
             _LOGGER.exception("Unexpected error running SSH command '%s'", command)
             return None
         else:
+            if adaptive:
+                self.latency.record(kind, time.monotonic() - started)
             if result.exit_status != 0:
                 _LOGGER.error(
                     "Command \n\t%s\nrun failed: %s | %s",
@@ -139,50 +619,213 @@ class OpenWRTSSH:
                 )
             return result
 
-    async def connect_tunneled(self, host: str, key_path: Path, username: str = "root"):
-        """Open SSH connection to host tunneled inside current connection."""
-        if self.conn is None:
-            raise RuntimeError("Base connection is not active")
-
-        return await self.conn.connect_ssh(
-            host=host,
-            username=username,
-            client_keys=[str(key_path)],
-            known_hosts=None,
-            connect_timeout=self.connect_timeout,
-        )
-
-    async def _list_installed_packages(self) -> list[str]:
-        """Return the list of installed package names on the device.
+    async def _run_tracked(
+        self, command: str, timeout: float | None
+    ) -> asyncssh.SSHCompletedProcess:
+        """Run command as a remote process whose PID is known.
 
-        Uses `opkg list-installed` and strips versions, keeping only names.
-        Falls back to empty list if command fails.
+        The remote shell prints its PID first, so a timed-out or cancelled
+        command can be killed on the device instead of being left running.
         """
-        cmd = "opkg list-installed | cut -d' ' -f1"
-        res = await self.exec_command(cmd)
-        if res is None or not res.stdout:
+        conn = self.conn
+        pid: int | None = None
+        async with self._channels:
+            process = await conn.create_process(
+                f"sh -c {shlex.quote(f'echo {_PID_MARKER} $$; {command}')}"
+            )
+            try:
+                async with asyncio.timeout(timeout):
+                    pid_line = await process.stdout.readline()
+                    if pid_line.startswith(_PID_MARKER):
+                        pid = int(pid_line.removeprefix(_PID_MARKER))
+                    return await process.wait()
+            except TimeoutError:
+                process.close()
+            except asyncio.CancelledError:
+                process.close()
+                if pid is not None:
+                    task = asyncio.get_running_loop().create_task(
+                        self._terminate_remote(conn, pid)
+                    )
+                    _BACKGROUND_TASKS.add(task)
+                    task.add_done_callback(_BACKGROUND_TASKS.discard)
+                raise
+
+        # Timed out. Terminate outside the slot so a full cap cannot block it
+        if pid is not None:
+            await self._terminate_remote(conn, pid)
+        raise TimeoutError(f"command exceeded {timeout}s")
+
+    async def _terminate_remote(
+        self, conn: asyncssh.SSHClientConnection, pid: int
+    ) -> None:
+        """Terminate a remote process tree with SIGTERM, escalating to SIGKILL."""
+        script = _TERMINATE_SCRIPT.format(pid=pid, grace=TERMINATE_GRACE_SECONDS)
+        try:
+            async with self._channels:
+                res = await asyncio.wait_for(
+                    conn.run(f"sh -c {shlex.quote(script)}"),
+                    TERMINATE_GRACE_SECONDS + 5,
+                )
+        except Exception as err:
             _LOGGER.warning(
-                "Failed to fetch installed packages on %s, returning empty list",
+                "Failed to terminate remote process %s on %s: %s", pid, self.ip, err
+            )
+            return
+
+        leaked = [
+            line
+            for line in (res.stdout or "").splitlines()
+            if line.startswith("leaked")
+        ]
+        if leaked:
+            self.leaked_processes += len(leaked)
+            if self.pool is not None:
+                self.pool.record_leaked(self.ip, len(leaked))
+            _LOGGER.warning(
+                "%d remote process(es) survived SIGKILL on %s (pid %s)",
+                len(leaked),
                 self.ip,
+                pid,
             )
-            return []
+        else:
+            _LOGGER.debug("Terminated remote process tree %s on %s", pid, self.ip)
 
-        packages = [line.strip() for line in res.stdout.splitlines() if line.strip()]
-        _LOGGER.debug("Installed packages on %s: %d found", self.ip, len(packages))
-        return packages
+    async def run_disruptive(
+        self,
+        command: str,
+        *,
+        timeout: float,
+        on_line: Callable[[str], None] | None = None,
+        done_markers: tuple[str, ...] = (),
+    ) -> CommandOutcome:
+        """Run a command that is expected to end the SSH session.
+
+        Output is streamed line by line to `on_line`. The command counts as
+        successful when a line contains one of `done_markers`, when the
+        session drops without an exit status after the command printed
+        output, or when it exits with 0 (or reports 0 after `EXIT_MARKER`,
+        which also ends the wait). A stale pooled connection is replaced once
+        if the command cannot be started. The channel is closed on return
+        without killing the remote process tree; commands that must outlive
+        it have to detach themselves (see `OpenWRTUpdater`).
+        """
+        outcome = CommandOutcome()
+        if self.conn is None:
+            await self.connect()
+        if not self.available or self.conn is None:
+            return outcome
+
+        process = None
+        try:
+            async with asyncio.timeout(timeout):
+                process = await self._start_disruptive(command)
+                async for raw_line in process.stdout:
+                    line = raw_line.rstrip("\n")
+                    outcome.lines.append(line)
+                    del outcome.lines[:-_OUTCOME_TAIL_LINES]
+                    if line.startswith(EXIT_MARKER):
+                        outcome.exit_status = int(line.removeprefix(EXIT_MARKER))
+                        outcome.success = outcome.exit_status == 0
+                        return outcome
+                    if on_line is not None:
+                        on_line(line)
+                    if any(marker in line for marker in done_markers):
+                        _LOGGER.debug(
+                            "%s reached %r, not waiting further", self.ip, line
+                        )
+                        outcome.success = True
+                        return outcome
+                await process.wait()
+        except TimeoutError:
+            _LOGGER.warning("Disruptive command timed out on %s: %s", self.ip, command)
+            return outcome
+        except _CONNECTION_LOST_ERRORS as err:
+            if process is None or not outcome.lines:
+                # The command never ran or never got going; nothing to trust
+                _LOGGER.warning(
+                    "Session to %s lost before %s produced output: %s",
+                    self.ip,
+                    command,
+                    err,
+                )
+                return outcome
+            _LOGGER.debug("Session to %s dropped as expected: %s", self.ip, err)
+            outcome.disconnected = True
+            outcome.success = True
+            return outcome
+        finally:
+            if process is not None:
+                process.close()
+
+        if outcome.exit_status is None:
+            outcome.exit_status = process.exit_status
+        if process.exit_status is None:
+            # EOF without exit status: the device closed the session
+            outcome.disconnected = True
+            outcome.success = bool(outcome.lines)
+        else:
+            outcome.success = outcome.exit_status == 0
+        return outcome
 
-    async def _find_downloaded_firmware(self) -> tuple[str | None, bool]:
-        """Check for a downloaded firmware image; adjust glob/path to your flow.
+    async def _start_disruptive(self, command: str) -> asyncssh.SSHClientProcess:
+        """Start a disruptive command, reconnecting once on a stale pooled link."""
+        try:
+            return await self.conn.create_process(
+                f"sh -c {shlex.quote(command)}", stderr=asyncssh.STDOUT
+            )
+        except _CONNECTION_LOST_ERRORS:
+            if self.pool is None:
+                raise
+            _LOGGER.debug("Pooled SSH connection to %s lost, reconnecting", self.ip)
+            await self._reconnect()
+            return await self.conn.create_process(
+                f"sh -c {shlex.quote(command)}", stderr=asyncssh.STDOUT
+            )
 
-        Returns:
-            (firmware_file_path, firmware_downloaded_flag)
+    async def stream_lines(self, command: str) -> AsyncIterator[str]:
+        """Yield output lines of a long-running command until it ends.
 
+        Meant for event sources like `ubus listen`: there is no timeout and
+        the channel does not take one of the connection's command slots.
+        Connection loss propagates to the caller; the remote process is
+        closed when the consumer stops iterating.
         """
-        res = await self.exec_command("ls -1 /tmp/openwrt*.bin 2>/dev/null | head -n1")
-        if res is None or not res.stdout:
-            return None, False
-        fw_file = _first_line(res.stdout)
-        return fw_file, bool(fw_file)
+        if self.conn is None:
+            await self.connect()
+        if not self.available or self.conn is None:
+            return
+
+        process = await self.conn.create_process(
+            f"sh -c {shlex.quote(command)}", stderr=asyncssh.DEVNULL
+        )
+        try:
+            async for raw_line in process.stdout:
+                yield raw_line.rstrip("\n")
+        finally:
+            process.close()
+
+    async def _reconnect(self) -> None:
+        """Drop the current pooled connection and borrow a fresh one."""
+        if self.pool is not None and self.conn is not None:
+            self.pool.invalidate(self.conn)
+        await self.close()
+        await self.connect()
+        if self.conn is None:
+            raise asyncssh.ConnectionLost(f"Unable to reconnect to {self.ip}")
+
+    async def connect_tunneled(self, host: str, key_path: Path, username: str = "root"):
+        """Open SSH connection to host tunneled inside current connection."""
+        if self.conn is None:
+            raise RuntimeError("Base connection is not active")
+
+        return await self.conn.connect_ssh(
+            host=host,
+            username=username,
+            client_keys=await async_load_client_keys(str(key_path)),
+            known_hosts=None,
+            connect_timeout=self.connect_timeout or self._timeout("connect"),
+        )
 
     async def check_cached_firmware(
         self, builder_dir: str, os: str, filename: str
@@ -197,42 +840,16 @@ class OpenWRTSSH:
         res = await self.exec_command(f"ls -1 {command} 2>/dev/null | head -n1")
         if res is None or not res.stdout:
             return None, False
-        fw_file = _first_line(res.stdout)
+        fw_file = first_line(res.stdout)
         return fw_file, bool(fw_file)
 
-    async def _read_board(self) -> tuple:
-        """Read board info using `ubus call system board`.
-
-        Returns:
-            Tuple of (hostname, os_version, distribution, target, board_name).
-
-        Raises:
-            RuntimeError: If board info could not be read or parsed.
-
-        """
-        cmd = "ubus call system board"
-        res = await self.exec_command(cmd)
-
-        if res is None or not res.stdout:
-            _LOGGER.error("Device %s did not respond about board", self.ip)
-            return None, None, None, None, None
-
-        try:
-            board = json.loads(res.stdout)
-        except json.JSONDecodeError as err:
-            raise RuntimeError("Failed to parse board info JSON") from err
-
-        return (
-            board["hostname"],
-            board["release"]["version"],
-            board["release"]["distribution"],
-            board["release"]["target"],
-            board["board_name"],
-        )
-
     async def close(self) -> None:
-        """Close the SSH connection."""
-        if self.conn is not None:
+        """Close the SSH connection or return it to the pool."""
+        if self.conn is not None and self.pool is not None:
+            self.pool.release(self.conn)
+            self.conn = None
+            self.available = False
+        elif self.conn is not None:
             try:
                 self.conn.close()
                 await self.conn.wait_closed()
@@ -241,87 +858,50 @@ class OpenWRTSSH:
             finally:
                 self.conn = None
                 self.available = False
+                if self._jump_conn is not None:
+                    self._jump_conn.close()
+                    self._jump_conn = None
 
     async def async_get_device_info(
-        self,
-    ) -> tuple[
-        str | None,  # os_version
-        bool,  # status (online)
-        bool | None,  # firmware_downloaded
-        str | None,  # firmware_file
-        str | None,  # hostname
-        str | None,  # distribution
-        str | None,  # target
-        str | None,  # board_name
-        list[str],  # installed packages
-        bool,  # has_asu_client
-    ]:
-        """Get device info: OS, status, firmware info and installed packages."""
-
-        offline_result = (
-            None,  # os_version
-            False,  # status
-            None,  # firmware_downloaded
-            None,  # firmware_file
-            None,  # hostname
-            None,  # distribution
-            None,  # target
-            None,  # board_name
-            [],  # installed packages
-            False,  # has_asu_client
-        )
+        self, previous: DeviceProbe | None = None
+    ) -> DeviceProbe:
+        """Get device info: OS, status, firmware info and installed packages.
 
+        All facts are gathered by one framed remote script (see `probe.py`),
+        so the device is contacted with a single command per poll. Static
+        facts from `previous` are reused while the device boot id is unchanged.
+        """
         try:
             async with self:
-                status = True
-
-                fw_file, fw_downloaded = await self._find_downloaded_firmware()
-
-                (
-                    hostname,
-                    os_version,
-                    distribution,
-                    target,
-                    board_name,
-                ) = await self._read_board()
+                res = await self.exec_command(
+                    build_probe_script(previous), kind="probe"
+                )
+                if res is None or not res.stdout:
+                    _LOGGER.error("Device %s did not respond to probe", self.ip)
+                    # Not online: nothing is known about the device state
+                    return DeviceProbe(errors={"probe": "no output"})
 
-                pkgs = await self._list_installed_packages()
-                has_asu_client = "owut" in pkgs or "auc" in pkgs
+                probe = build_device_probe(parse_probe_output(res.stdout), previous)
 
-        except (TimeoutError, asyncssh.Error, OSError, RuntimeError) as exc:
-            # Expected runtime problems: SSH/transport issues, invalid board JSON, etc.
+        except (TimeoutError, asyncssh.Error, OSError) as exc:
+            # Expected runtime problems: SSH/transport issues
             _LOGGER.debug("Device info over SSH fetch failed for %s: %s", self.ip, exc)
-            return offline_result
+            return DeviceProbe()
 
         except Exception as exc:
-            # Truly unexpected error – log full traceback, but keep consistent return type.
+            # Truly unexpected error – log it, but keep consistent return type.
             _LOGGER.error(
                 "Unexpected error while fetching device info over SSH for %s: %s",
                 self.ip,
                 exc,
             )
-            return offline_result
-
-        return (
-            os_version,
-            status,
-            fw_downloaded,
-            fw_file,
-            hostname,
-            distribution,
-            target,
-            board_name,
-            pkgs,
-            has_asu_client,
-        )
+            return DeviceProbe()
 
-
-def _first_line(text: str | None) -> str | None:
-    """Return the first non-empty line from text, or None."""
-    if not text:
-        return None
-    for line in text.splitlines():
-        s = line.strip()
-        if s:
-            return s
-    return None
+        for section, error in probe.errors.items():
+            _LOGGER.warning(
+                "Probe section %s failed on %s: %s", section, self.ip, error
+            )
+        _LOGGER.debug(
+            "Installed packages on %s: %d found", self.ip, len(probe.packages)
+        )
+        return probe
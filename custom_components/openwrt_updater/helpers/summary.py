@@ -0,0 +1,123 @@
+"""Fleet summary counters maintained as deltas from device snapshots.
+
+Each device contributes one small record (online, outdated, firmware
+version, staged firmware). When a device coordinator publishes a changed
+snapshot, its old record is subtracted and the new one added, so the
+summary never rescans the fleet.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+
+from .types import DeviceSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class _Contribution:
+    """What one device adds to a fleet summary."""
+
+    online: bool = False
+    outdated: bool = False
+    version: str | None = None
+    staged: bool = False
+
+    @classmethod
+    def of(cls, snapshot: DeviceSnapshot | None, success: bool) -> _Contribution:
+        """Derive the contribution of a device from its latest snapshot."""
+        if snapshot is None:
+            return cls()
+        available = snapshot.available_os_version
+        return cls(
+            online=success and snapshot.status,
+            outdated=bool(available)
+            and available != snapshot.current_os_version
+            and snapshot.current_os_version is not None,
+            version=snapshot.current_os_version,
+            staged=bool(snapshot.firmware_downloaded),
+        )
+
+
+class FleetSummary:
+    """Online, outdated, staged and per-version counts over a set of devices."""
+
+    def __init__(self) -> None:
+        """Initialize an empty summary."""
+        self._devices: dict[str, _Contribution] = {}
+        self.online = 0
+        self.outdated: set[str] = set()
+        self.staged: set[str] = set()
+        self._versions: Counter[str] = Counter()
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def total(self) -> int:
+        """Return the number of devices in the summary."""
+        return len(self._devices)
+
+    @property
+    def versions(self) -> dict[str, int]:
+        """Return the number of devices per known firmware version."""
+        return dict(self._versions.most_common())
+
+    def update(self, ip: str, snapshot: DeviceSnapshot | None, success: bool) -> None:
+        """Apply the latest snapshot of a device as a delta."""
+        new = _Contribution.of(snapshot, success)
+        old = self._devices.get(ip)
+        if old == new:
+            return
+        self._subtract(ip, old)
+        self._devices[ip] = new
+        self.online += new.online
+        if new.outdated:
+            self.outdated.add(ip)
+        if new.staged:
+            self.staged.add(ip)
+        if new.version:
+            self._versions[new.version] += 1
+        self._notify()
+
+    def remove(self, ip: str) -> None:
+        """Drop a device from the summary."""
+        old = self._devices.pop(ip, None)
+        if old is None:
+            return
+        self._subtract(ip, old)
+        self._notify()
+
+    def _subtract(self, ip: str, old: _Contribution | None) -> None:
+        """Remove a previous contribution from the counters."""
+        if old is None:
+            return
+        self.online -= old.online
+        self.outdated.discard(ip)
+        self.staged.discard(ip)
+        if old.version:
+            self._versions[old.version] -= 1
+            if not self._versions[old.version]:
+                del self._versions[old.version]
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call `listener` whenever a count changes; returns the remover."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _notify(self) -> None:
+        """Call all listeners."""
+        for listener in list(self._listeners):
+            listener()
+
+    def diagnostics(self) -> dict:
+        """Return the current counts."""
+        return {
+            "total": self.total,
+            "online": self.online,
+            "outdated": sorted(self.outdated),
+            "staged": sorted(self.staged),
+            "versions": self.versions,
+        }
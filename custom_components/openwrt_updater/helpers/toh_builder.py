@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from typing import Any
+from urllib.parse import urlsplit
 
 from aiohttp import ClientTimeout
 
@@ -15,6 +17,9 @@ from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+# Concurrent profile downloads per download host
+PROFILE_FETCHES_PER_HOST = 4
+
 
 class LocalTOH:
     """Build a local TOH index from overview and profile JSON files.
@@ -28,6 +33,12 @@ class LocalTOH:
         """Initialize TOH wrapper."""
         self.hass = hass
         self.index: dict[str, Any] = {}
+        # Last overview, reused by incremental index updates
+        self.overview: dict[str, Any] = {}
+        self._profiles: dict[tuple[str, str], dict[str, str]] = {}
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        # Target -> error of the last resolve, for targets that could not be fetched
+        self.failed_targets: dict[str, str] = {}
 
         self._base_url = hass.data[DOMAIN].get("config", {})["download_base_url"]
         self._headers = {
@@ -42,48 +53,113 @@ class LocalTOH:
             raw: Raw SysUpgrade overview JSON structure.
 
         """
-        self.index = {}
-        # try:
-        orig_boards = self.hass.data[DOMAIN]["boards"]
-        my_targets = {target: set(boards) for target, boards in orig_boards.items()}
-        branches = raw.get("branches", {})
-        # Ignore snapshot branch
-        branches.pop("SNAPSHOT", None)
-        # Iterate through branches
-        for branch in branches.values():
-            # Get last version from supported
-            version = branch["versions"][0]
-            # Iterate through my targets
-            for target, boards in dict(my_targets).items():
-                # Init index for target
-                # _LOGGER.error("Adding target %s to index", target)
-                self.index.setdefault(target, {})
-                # Check if my target is in this branch
-                if target in branch.get("targets", []):
-                    # Get profiles for this target
-                    profiles = await self._download_profile(version, target)
-                    # Iterate through my boards within my target
-                    for board in list(boards):
-                        # Check if my board is in profiles
-                        board_derived = board.replace(",", "_")
-                        if board_derived in profiles:
-                            # If IS then save it to index and remove it from scope
-                            # _LOGGER.warning("Adding board %s to %s", board, target)
-                            self.index[target].setdefault(
-                                board, {"version": "", "sysupgrade_url": ""}
-                            )
-                            self.index[target][board]["version"] = version
-                            self.index[target][board]["sysupgrade_url"] = profiles[
-                                board_derived
-                            ]
-                            my_targets[target].remove(board)
-                    # Remove whole target from scope if empty
-                    if len(my_targets[target]) == 0:
-                        my_targets.pop(target)
-                if len(my_targets) == 0:
-                    break
-        # except Exception as e:
-        #    _LOGGER.error("SysUpgrade overview parse failed: %s", e)
+        self.overview = raw
+        # A full rebuild picks up new releases, so cached profiles are stale
+        self._profiles = {}
+        self.index = await self._resolve(raw, self.hass.data[DOMAIN]["boards"])
+
+    async def extend_index(self, boards: dict[str, set[str]]) -> None:
+        """Resolve only `boards` against the cached overview and merge them.
+
+        Profiles already downloaded for a target are reused, so only targets
+        that were never resolved cause downloads.
+
+        Args:
+            boards: Map of target to the board names to add.
+
+        """
+        if not self.overview:
+            self.overview = await self.download_overview()
+        found = await self._resolve(self.overview, boards)
+        # Replace rather than mutate, entities may be reading the old index
+        index = dict(self.index)
+        for target, entries in found.items():
+            index[target] = {**index.get(target, {}), **entries}
+        self.index = index
+
+    async def _resolve(
+        self, raw: dict[str, Any], boards: dict[str, set[str]]
+    ) -> dict[str, Any]:
+        """Return index entries of `boards` found in the overview `raw`.
+
+        Works in rounds: each round plans one profile fetch per target, from
+        the newest branch not tried yet that carries the target, and runs
+        the fetches concurrently. Boards not found move on to the next
+        round. Results are merged in target order, so the index does not
+        depend on which download finished first. Targets whose download
+        failed are left out and listed in `failed_targets`.
+
+        Args:
+            raw: Raw SysUpgrade overview JSON structure.
+            boards: Map of target to the board names to look up.
+
+        """
+        index: dict[str, Any] = {target: {} for target in sorted(boards)}
+        my_targets = {target: set(names) for target, names in boards.items() if names}
+        # (version, targets) per branch, newest first, ignoring the snapshot branch
+        branches = [
+            (branch["versions"][0], set(branch.get("targets", [])))
+            for branch_name, branch in raw.get("branches", {}).items()
+            if branch_name != "SNAPSHOT"
+        ]
+        next_branch = dict.fromkeys(my_targets, 0)
+        failed: dict[str, str] = {}
+
+        while my_targets:
+            # Plan this round's fetches
+            plan: dict[str, str] = {}
+            for target in sorted(my_targets):
+                position = next_branch[target]
+                while position < len(branches) and target not in branches[position][1]:
+                    position += 1
+                if position == len(branches):
+                    # No (older) branch carries this target
+                    my_targets.pop(target)
+                    continue
+                next_branch[target] = position + 1
+                plan[target] = branches[position][0]
+            if not plan:
+                break
+
+            results = await asyncio.gather(
+                *(self._cached_profile(v, t) for t, v in plan.items()),
+                return_exceptions=True,
+            )
+            for (target, version), profiles in zip(plan.items(), results, strict=True):
+                if isinstance(profiles, asyncio.CancelledError):
+                    raise profiles
+                if isinstance(profiles, Exception):
+                    _LOGGER.warning(
+                        "Profiles of %s %s failed: %s", version, target, profiles
+                    )
+                    failed[target] = f"{version}: {profiles}"
+                    my_targets.pop(target)
+                    continue
+                names = my_targets[target]
+                for board in sorted(names):
+                    board_derived = board.replace(",", "_")
+                    if board_derived in profiles:
+                        index[target][board] = {
+                            "version": version,
+                            "sysupgrade_url": profiles[board_derived],
+                        }
+                        names.remove(board)
+                # Remove whole target from scope if empty
+                if not names:
+                    my_targets.pop(target)
+
+        self.failed_targets = failed
+        return index
+
+    async def _cached_profile(self, version: str, target: str) -> dict[str, str]:
+        """Return profiles of a version and target, downloading them once.
+
+        Failed downloads are not cached, so the next update retries them.
+        """
+        key = (version, target)
+        if key not in self._profiles:
+            self._profiles[key] = await self._download_profile(version, target)
+        return self._profiles[key]
 
     async def _download_profile(self, version, target) -> list[list[str]]:
         """Download a profile file for a specific version and target.
@@ -100,9 +176,16 @@ class LocalTOH:
         result = {}
         session = async_get_clientsession(self.hass)
         timeout = ClientTimeout(total=5)
-        async with session.get(
-            f"{base_url}profiles.json", headers=self._headers, timeout=timeout
-        ) as resp:
+        host = urlsplit(base_url).netloc
+        slots = self._host_slots.setdefault(
+            host, asyncio.Semaphore(PROFILE_FETCHES_PER_HOST)
+        )
+        async with (
+            slots,
+            session.get(
+                f"{base_url}profiles.json", headers=self._headers, timeout=timeout
+            ) as resp,
+        ):
             _LOGGER.debug("Download profiles for %s_%s", version, target)
             resp.raise_for_status()
             try:
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Iterable
+from dataclasses import dataclass, field, fields, replace
+import sys
+from typing import Any
+from weakref import WeakValueDictionary
 
 
 @dataclass(slots=True)
@@ -14,3 +18,205 @@ class TohItem:
     subtarget: str | None = None
     snapshot_url: str | None = None
     compatibles: str | None = None
+
+
+@dataclass(slots=True)
+class ProbeSection:
+    """One framed section of the remote device probe output."""
+
+    name: str
+    body: str = ""
+    exit_status: int | None = None
+    error: str | None = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the section finished with exit status 0."""
+        return self.exit_status == 0
+
+
+@dataclass(slots=True)
+class BoardInfo:
+    """Facts from `ubus call system board`."""
+
+    hostname: str | None = None
+    os_version: str | None = None
+    distribution: str | None = None
+    target: str | None = None
+    board_name: str | None = None
+
+
+@dataclass(slots=True)
+class SystemInfo:
+    """Runtime telemetry from `ubus call system info` and the WAN interface.
+
+    Memory and filesystem sizes are in KiB, uptime in seconds.
+    """
+
+    uptime: int | None = None
+    load: tuple[float, float, float] | None = None
+    memory_total: int | None = None
+    memory_available: int | None = None
+    root_total: int | None = None
+    root_used: int | None = None
+    tmp_total: int | None = None
+    tmp_used: int | None = None
+    wan_address: str | None = None
+
+    @property
+    def root_used_percent(self) -> float | None:
+        """Return overlay (root) usage in percent."""
+        return _percent(self.root_used, self.root_total)
+
+    @property
+    def tmp_used_percent(self) -> float | None:
+        """Return /tmp usage in percent."""
+        return _percent(self.tmp_used, self.tmp_total)
+
+
+def _percent(used: int | None, total: int | None) -> float | None:
+    """Return used/total in percent rounded to 0.1, or None if unknown."""
+    if used is None or not total:
+        return None
+    return round(used * 100 / total, 1)
+
+
+@dataclass(slots=True)
+class DeviceProbe:
+    """Result of a single device probe round trip."""
+
+    online: bool = False
+    boot_id: str | None = None
+    board: BoardInfo = field(default_factory=BoardInfo)
+    board_cached: bool = False
+    system: SystemInfo = field(default_factory=SystemInfo)
+    firmware_file: str | None = None
+    package_fingerprint: str | None = None
+    # Shared set from intern_packages(), the same object the snapshot holds
+    packages: frozenset[str] = frozenset()
+    packages_cached: bool = False
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def firmware_downloaded(self) -> bool | None:
+        """Return whether a firmware image is staged in /tmp (None if offline)."""
+        if not self.online:
+            return None
+        return bool(self.firmware_file)
+
+    @property
+    def has_asu_client(self) -> bool:
+        """Return whether an attended sysupgrade client is installed."""
+        return "owut" in self.packages or "auc" in self.packages
+
+
+# Shared package sets by hash, alive while a snapshot uses them. Keyed by
+# hash rather than the set itself, which the dict would keep alive forever.
+_PACKAGE_SETS: WeakValueDictionary[int, frozenset[str]] = WeakValueDictionary()
+
+
+def intern_packages(names: Iterable[str]) -> frozenset[str]:
+    """Return the shared frozenset for a package set.
+
+    Devices with the same packages end up referencing one set, and name
+    strings are interned across sets, so memory stays flat as the fleet
+    grows. Comparing two snapshots with the same set is an identity check.
+    """
+    packages = frozenset(sys.intern(name) for name in names)
+    key = hash(packages)
+    shared = _PACKAGE_SETS.get(key)
+    if shared == packages:
+        return shared
+    _PACKAGE_SETS[key] = packages
+    return packages
+
+
+# Snapshot fields that change on every poll and do not count as activity
+TELEMETRY_FIELDS = frozenset(
+    {
+        "uptime",
+        "load_1m",
+        "load_5m",
+        "load_15m",
+        "memory_available",
+        "overlay_used_percent",
+        "tmp_used_percent",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceSnapshot:
+    """Immutable state of one device as published by its coordinator.
+
+    Equal polls produce equal snapshots, so the coordinator can skip
+    notifying entities. `stale` marks a snapshot restored from storage.
+    """
+
+    status: bool = False
+    current_os_version: str | None = None
+    available_os_version: str | None = None
+    snapshot_url: str | None = None
+    firmware_downloaded: bool | None = None
+    firmware_file: str | None = None
+    hostname: str | None = None
+    distribution: str | None = None
+    target: str | None = None
+    board_name: str | None = None
+    has_asu_client: bool = False
+    packages: frozenset[str] = frozenset()
+    uptime: int | None = None
+    load_1m: float | None = None
+    load_5m: float | None = None
+    load_15m: float | None = None
+    memory_total: int | None = None
+    memory_available: int | None = None
+    overlay_used_percent: float | None = None
+    tmp_used_percent: float | None = None
+    wan_address: str | None = None
+    stale: bool = False
+
+    def static_fields(self) -> tuple[Any, ...]:
+        """Return all fields except telemetry and `stale`, for change checks."""
+        return tuple(
+            getattr(self, f.name)
+            for f in fields(self)
+            if f.name not in TELEMETRY_FIELDS and f.name != "stale"
+        )
+
+    def with_changes(self, **changes: Any) -> DeviceSnapshot:
+        """Return a copy with some fields replaced."""
+        return replace(self, **changes)
+
+    def as_dict(self, *, telemetry: bool = True) -> dict[str, Any]:
+        """Return a JSON-serializable dict, packages as a sorted list."""
+        data = {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if telemetry or f.name not in TELEMETRY_FIELDS
+        }
+        data["packages"] = sorted(self.packages)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DeviceSnapshot:
+        """Build a snapshot from `as_dict()` output, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        values = {key: value for key, value in data.items() if key in known}
+        values["packages"] = intern_packages(values.get("packages") or ())
+        return cls(**values)
+
+
+@dataclass(slots=True)
+class CommandOutcome:
+    """Result of a command expected to drop the SSH session (sysupgrade, reboot).
+
+    `disconnected` is True when the session ended without an exit status,
+    which is the normal way such commands finish.
+    """
+
+    success: bool = False
+    exit_status: int | None = None
+    disconnected: bool = False
+    lines: list[str] = field(default_factory=list)
@@ -0,0 +1,261 @@
+"""Lightweight device probe over ubus JSON-RPC (rpcd + uhttpd-mod-ubus).
+
+A keep-alive HTTP request to `/ubus` is much cheaper for both sides than an
+SSH handshake plus a shell spawn, so devices with rpcd can be polled this
+way. SSH stays the fallback transport and is still used for upgrades.
+"""
+
+from __future__ import annotations
+
+from fnmatch import fnmatch
+import logging
+import time
+
+import aiohttp
+
+from .probe import (
+    PACKAGE_DBS,
+    board_info_from_ubus,
+    package_fingerprint,
+    parse_package_db,
+    system_info_from_ubus,
+)
+from .types import DeviceProbe, intern_packages
+
+_LOGGER = logging.getLogger(__name__)
+
+# Session id used for the login call
+_ANONYMOUS_SESSION = "0" * 32
+# ubus status codes
+UBUS_STATUS_OK = 0
+UBUS_STATUS_NOT_FOUND = 4
+UBUS_STATUS_PERMISSION_DENIED = 6
+# Renew the session this many seconds before rpcd expires it
+_SESSION_MARGIN = 10.0
+# Requested session lifetime (rpcd default is 300 s)
+SESSION_TIMEOUT = 3600
+
+
+def _payload(result: list) -> dict | None:
+    """Return the data of a successful call result, or None."""
+    if result[0] != UBUS_STATUS_OK:
+        return None
+    return result[1] if len(result) > 1 else {}
+
+
+class UbusError(Exception):
+    """ubus call returned a non-zero status."""
+
+    def __init__(self, status: int, obj: str, method: str) -> None:
+        """Store the failing call."""
+        super().__init__(f"ubus {obj}.{method} failed with status {status}")
+        self.status = status
+
+
+class OpenWRTUbus:
+    """Device probe transport over ubus JSON-RPC.
+
+    Keeps the rpcd session token until it expires; uses the shared aiohttp
+    session so TCP connections are pooled and kept alive.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        ip: str,
+        username: str,
+        password: str,
+        timeout: float = 5.0,
+    ) -> None:
+        """Initialize transport for one device."""
+        self.ip = ip
+        self.username = username
+        self.password = password
+        self.url = f"http://{ip}/ubus"
+        self._session = session
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._token: str | None = None
+        self._token_expires = 0.0
+        self._request_id = 0
+
+    async def _post(self, calls: list[tuple[str, str, str, dict]]) -> list:
+        """Send a batch of (session, object, method, args) calls.
+
+        Returns the raw result of each call, in order.
+        """
+        batch = []
+        for session_id, obj, method, args in calls:
+            self._request_id += 1
+            batch.append(
+                {
+                    "jsonrpc": "2.0",
+                    "id": self._request_id,
+                    "method": "call",
+                    "params": [session_id, obj, method, args],
+                }
+            )
+        async with self._session.post(
+            self.url, json=batch if len(batch) > 1 else batch[0], timeout=self._timeout
+        ) as resp:
+            resp.raise_for_status()
+            payload = await resp.json(content_type=None)
+
+        replies = payload if isinstance(payload, list) else [payload]
+        by_id = {reply.get("id"): reply for reply in replies}
+        first_id = self._request_id - len(batch) + 1
+        results = []
+        for offset, (_, obj, method, _) in enumerate(calls):
+            reply = by_id.get(first_id + offset, {})
+            if "error" in reply:
+                # JSON-RPC level error, e.g. expired or unknown session
+                results.append([UBUS_STATUS_PERMISSION_DENIED])
+            else:
+                results.append(reply.get("result") or [UBUS_STATUS_NOT_FOUND])
+            _LOGGER.debug(
+                "ubus %s.%s on %s -> %s", obj, method, self.ip, results[-1][0]
+            )
+        return results
+
+    async def _ensure_session(self) -> str:
+        """Return a valid session token, logging in if it expired."""
+        if self._token is not None and time.monotonic() < self._token_expires:
+            return self._token
+
+        (result,) = await self._post(
+            [
+                (
+                    _ANONYMOUS_SESSION,
+                    "session",
+                    "login",
+                    {
+                        "username": self.username,
+                        "password": self.password,
+                        "timeout": SESSION_TIMEOUT,
+                    },
+                )
+            ]
+        )
+        if (data := _payload(result)) is None:
+            raise UbusError(result[0], "session", "login")
+        self._token = data["ubus_rpc_session"]
+        self._token_expires = (
+            time.monotonic() + data.get("expires", SESSION_TIMEOUT) - _SESSION_MARGIN
+        )
+        return self._token
+
+    async def _call_batch(self, calls: list[tuple[str, str, dict]]) -> list:
+        """Run authenticated calls in one request, re-logging in once if denied."""
+        for attempt in range(2):
+            token = await self._ensure_session()
+            results = await self._post(
+                [(token, obj, method, args) for obj, method, args in calls]
+            )
+            denied = all(r[0] == UBUS_STATUS_PERMISSION_DENIED for r in results)
+            if not denied or attempt:
+                return results
+            # Session expired on the device side (reboot, rpcd restart)
+            self._token = None
+        return results
+
+    async def async_get_device_info(
+        self, previous: DeviceProbe | None = None
+    ) -> DeviceProbe:
+        """Get the same facts as the SSH probe over ubus.
+
+        One request reads board info, system info, WAN status, boot id, /tmp
+        listing and package database stats; the package database itself is
+        read only when its fingerprint differs from `previous`. Returns an
+        offline probe if HTTP fails, so the caller can fall back to SSH.
+        """
+        managers = list(PACKAGE_DBS)
+        try:
+            (
+                board_res,
+                info_res,
+                wan_res,
+                boot_res,
+                tmp_res,
+                *stat_res,
+            ) = await self._call_batch(
+                [
+                    ("system", "board", {}),
+                    ("system", "info", {}),
+                    ("network.interface.wan", "status", {}),
+                    ("file", "read", {"path": "/proc/sys/kernel/random/boot_id"}),
+                    ("file", "list", {"path": "/tmp"}),
+                    *(("file", "stat", {"path": PACKAGE_DBS[m]}) for m in managers),
+                ]
+            )
+        except (TimeoutError, aiohttp.ClientError, UbusError, ValueError) as err:
+            _LOGGER.debug("ubus probe of %s failed: %s", self.ip, err)
+            return DeviceProbe()
+
+        probe = DeviceProbe(online=True)
+        if (boot := _payload(boot_res)) is not None:
+            probe.boot_id = boot.get("data", "").strip() or None
+        self._apply_board(probe, board_res)
+        if (info := _payload(info_res)) is not None:
+            probe.system = system_info_from_ubus(info, _payload(wan_res))
+        else:
+            probe.errors["sysinfo"] = f"ubus status {info_res[0]}"
+        self._apply_firmware(probe, tmp_res)
+
+        manager, stat = next(
+            (
+                (m, stat)
+                for m, res in zip(managers, stat_res, strict=True)
+                if (stat := _payload(res)) is not None
+            ),
+            (None, None),
+        )
+        if manager is None:
+            probe.errors["packages"] = "no opkg or apk package database found"
+            return probe
+
+        probe.package_fingerprint = package_fingerprint(
+            manager, stat["mtime"], stat["size"]
+        )
+        if (
+            previous is not None
+            and previous.package_fingerprint == probe.package_fingerprint
+            and "packages" not in previous.errors
+        ):
+            probe.packages = previous.packages
+            probe.packages_cached = True
+            return probe
+
+        try:
+            (read_res,) = await self._call_batch(
+                [("file", "read", {"path": PACKAGE_DBS[manager]})]
+            )
+        except (TimeoutError, aiohttp.ClientError, UbusError, ValueError) as err:
+            probe.errors["packages"] = str(err)
+            return probe
+        if (content := _payload(read_res)) is None:
+            probe.errors["packages"] = f"file read failed with status {read_res[0]}"
+            return probe
+        probe.packages = intern_packages(
+            parse_package_db(manager, content.get("data", ""))
+        )
+        return probe
+
+    @staticmethod
+    def _apply_board(probe: DeviceProbe, result: list) -> None:
+        """Fill board facts from a `system board` result."""
+        if (board := _payload(result)) is None:
+            probe.errors["board"] = f"ubus status {result[0]}"
+            return
+        probe.board = board_info_from_ubus(board)
+
+    @staticmethod
+    def _apply_firmware(probe: DeviceProbe, result: list) -> None:
+        """Find a staged firmware image in a `file list /tmp` result."""
+        if (listing := _payload(result)) is None:
+            probe.errors["firmware"] = f"ubus status {result[0]}"
+            return
+        names = sorted(
+            entry["name"]
+            for entry in listing.get("entries", [])
+            if fnmatch(entry.get("name", ""), "openwrt*.bin")
+        )
+        probe.firmware_file = f"/tmp/{names[0]}" if names else None
@@ -2,43 +2,55 @@
 
 import logging
 import re
+import shlex
 
 from asyncssh import scp
 
 from homeassistant.core import HomeAssistant
 
 from .asu_client import ASUClient
-from .const import DOMAIN
-from .ssh_client import OpenWRTSSH
+from .const import DOMAIN, EVENT_UPGRADE_LOG
+from .helpers import parse_builder_location
+from .scheduler import PRIORITY_USER
+from .ssh_client import EXIT_MARKER, OpenWRTSSH
+from .types import CommandOutcome
 
 _LOGGER = logging.getLogger(__name__)
 
+SYSUPGRADE_LOG = "/tmp/sysupgrade.log"
+# sysupgrade output once flashing starts and all SSH sessions are closed
+SYSUPGRADE_DONE_MARKERS = (
+    "Commencing upgrade",
+    "Performing system upgrade",
+)
+
 
 class OpenWRTUpdater:
     """Run firmware upgrade actions for a specific device."""
 
     def __init__(self, hass: HomeAssistant, config_entry_id, ip: str) -> None:
         """Initialize updater state for one device."""
+        self.hass = hass
         self.ip = ip
         self.config = hass.data[DOMAIN].get("config", {})
+        self.ssh_pool = hass.data[DOMAIN]["ssh_pool"]
         data = hass.data[DOMAIN][config_entry_id].get(self.ip, {})
         coordinator = data["coordinator"].data
         # merge all dicts
         self.data = {
             **data,
-            **coordinator,
+            **coordinator.as_dict(),
             **hass.data[DOMAIN][config_entry_id].get("data", {}),
         }
 
-        builder_location = re.fullmatch(
-            r"([^@]+)@([^:]+):(.+)", self.config["builder_location"]
-        )
-        if not builder_location:
-            raise ValueError(
-                f"Invalid builder_location: {self.config['builder_location']!r}, expected format 'user@host:/dir'"
-            )
         self.master_username, self.master_host, self.builder_dir = (
-            builder_location.groups()
+            parse_builder_location(self.config["builder_location"])
+        )
+        # Devices only reachable through the builder node
+        self.jump = (
+            (self.master_username, self.master_host)
+            if data.get("use_jump_host")
+            else None
         )
 
         self.key_path = self.config["ssh_key_path"]
@@ -50,13 +62,27 @@ class OpenWRTUpdater:
         self._sanitized_filename = f"{self._sanitize(self.data['target'])}-{self._sanitize(self.data['board_name'])}-sysupgrade.bin"
 
     def _sysupgrade_command(self, firmware_file: str) -> str:
-        """Compose sysupgrade command."""
+        """Compose sysupgrade command.
+
+        sysupgrade runs detached, writing only to /tmp/sysupgrade.log, so
+        closing the SSH channel cannot interrupt the flash. The log is
+        streamed with `tail -f`; the exit status is printed after EXIT_MARKER.
+        """
+        upgrade = shlex.quote(
+            f"/sbin/sysupgrade -v /tmp/{firmware_file}; echo {EXIT_MARKER} $?"
+        )
         return (
-            # f"/sbin/sysupgrade -T -v /tmp/{firmware_file} >/tmp/sysupgrade.log 2>&1 &"
-            f"/sbin/sysupgrade -v /tmp/{firmware_file} >/tmp/sysupgrade.log 2>&1"
-            # f"sysupgrade -v /tmp/{firmware_file}"
+            f": >{SYSUPGRADE_LOG}\n"
+            "if command -v setsid >/dev/null 2>&1; then _detach=setsid; "
+            "else _detach=nohup; fi\n"
+            f"$_detach sh -c {upgrade} </dev/null >{SYSUPGRADE_LOG} 2>&1 &\n"
+            f"exec tail -n +1 -f {SYSUPGRADE_LOG}"
         )
 
+    def _fire_log_event(self, line: str) -> None:
+        """Publish one line of upgrade output as a Home Assistant event."""
+        self.hass.bus.async_fire(EVENT_UPGRADE_LOG, {"ip": self.ip, "line": line})
+
     def _sanitize(self, s: str):
         """Normalize a string for use in a safe firmware filename."""
         return re.sub(
@@ -74,6 +100,8 @@ class OpenWRTUpdater:
         """Convert command output to success/exit status/return code triple."""
         if output is None:
             return False, None, None
+        if isinstance(output, CommandOutcome):
+            return output.success, output.exit_status, None
 
         exit_status = getattr(output, "exit_status", None)
         return_code = getattr(output, "return_code", None)
@@ -91,7 +119,11 @@ class OpenWRTUpdater:
         cached=None,
         raw=None,
     ) -> dict:
-        """Build a normalized upgrade result payload."""
+        """Build a normalized upgrade result payload.
+
+        `flashing` tells callers sysupgrade got far enough to flash (done
+        marker or dropped session); `disconnected` whether the session dropped.
+        """
         return {
             "success": success,
             "method": method,
@@ -99,38 +131,67 @@ class OpenWRTUpdater:
             "exit_status": exit_status,
             "return_code": return_code,
             "cached": cached,
+            "flashing": isinstance(raw, CommandOutcome) and raw.success,
+            "disconnected": isinstance(raw, CommandOutcome) and raw.disconnected,
             "raw": raw,
         }
 
     async def cache_asu_firmware(self, firmware_url: str):
         """Cache the built firmware image on the master node."""
         async with OpenWRTSSH(
-            ip=self.master_host, username=self.master_username, key_path=self.key_path
+            ip=self.master_host,
+            username=self.master_username,
+            key_path=self.key_path,
+            pool=self.ssh_pool,
+            priority=PRIORITY_USER,
         ) as master:
             command = f"curl -L --fail --silent --show-error --create-dirs {firmware_url} --output {self.builder_dir}cache/{self.available_os_version}/{self._sanitized_filename}"
             await master.exec_command(command=command, timeout=900)
 
-    async def sysupgrade(self, firmware_file: str):
-        """Run sysupgrade with the given firmware file."""
+    async def sysupgrade(self, firmware_file: str) -> CommandOutcome:
+        """Run sysupgrade with the given firmware file.
+
+        Returns as soon as flashing commences or the device drops the session;
+        output lines are fired as EVENT_UPGRADE_LOG events meanwhile.
+        """
         _LOGGER.debug("Trying to update %s with local file %s", self.ip, firmware_file)
         update_command = self._sysupgrade_command(firmware_file)
-        async with OpenWRTSSH(self.ip, self.key_path) as client:
+        async with OpenWRTSSH(
+            self.ip,
+            self.key_path,
+            pool=self.ssh_pool,
+            jump=self.jump,
+            priority=PRIORITY_USER,
+        ) as client:
             _LOGGER.debug(
                 "Start sysupgrade on %s with command %s", self.ip, update_command
             )
-            return await client.exec_command(update_command, timeout=1800)
+            return await client.run_disruptive(
+                update_command,
+                timeout=1800,
+                on_line=self._fire_log_event,
+                done_markers=SYSUPGRADE_DONE_MARKERS,
+            )
 
     async def simple_upgrade(self):
         """Run a direct snapshot-based upgrade from TOH data."""
         try:
             _LOGGER.debug("Trying to simple update %s", self.ip)
             _LOGGER.debug("Downloading %s", self.snapshot_url)
-            update_command = f"curl -L --fail --silent --show-error {self.snapshot_url} --output /tmp/openwrt-{self.available_os_version}-simple.bin"
-            if self.is_force:
-                update_command = f"{update_command} && {self._sysupgrade_command(f'openwrt-{self.available_os_version}-simple.bin')}"
-            async with OpenWRTSSH(self.ip, self.key_path) as client:
+            firmware_file = f"openwrt-{self.available_os_version}-simple.bin"
+            update_command = f"curl -L --fail --silent --show-error {self.snapshot_url} --output /tmp/{firmware_file}"
+            async with OpenWRTSSH(
+                self.ip,
+                self.key_path,
+                pool=self.ssh_pool,
+                jump=self.jump,
+                priority=PRIORITY_USER,
+            ) as client:
                 output = await client.exec_command(update_command, timeout=900)
-            _LOGGER.debug("Update result: %s", output)
+            _LOGGER.debug("Download result: %s", output)
+            if self.is_force and self._status_from_output(output)[0]:
+                output = await self.sysupgrade(firmware_file)
+                _LOGGER.debug("Update result: %s", output)
         except Exception as err:
             _LOGGER.error("Failed to run simple update for %s: %s", self.ip, err)
             return self._build_result("simple", False, message=err)
@@ -188,6 +249,8 @@ class OpenWRTUpdater:
                 username=self.master_username,
                 key_path=self.key_path,
                 agent_forwarding=True,
+                pool=self.ssh_pool,
+                priority=PRIORITY_USER,
             ) as master:
                 router = await master.connect_tunneled(
                     host=self.ip, key_path=self.key_path
@@ -238,7 +301,11 @@ class OpenWRTUpdater:
     async def _check_cache(self) -> tuple[str, bool]:
         """Check whether the expected firmware image is already cached."""
         async with OpenWRTSSH(
-            ip=self.master_host, username=self.master_username, key_path=self.key_path
+            ip=self.master_host,
+            username=self.master_username,
+            key_path=self.key_path,
+            pool=self.ssh_pool,
+            priority=PRIORITY_USER,
         ) as master:
             fw_file, cached = await master.check_cached_firmware(
                 self.builder_dir, self.available_os_version, self._sanitized_filename
@@ -94,6 +94,7 @@ class OpenWRTOptionsFlowHandler(config_entries.OptionsFlow):
             )
             if device_entry is not None:
                 device_registry.async_remove_device(device_entry.id)
+            self.hass.data[DOMAIN]["snapshots"].remove(remove_ip)
 
             return self.async_create_entry(
                 title="",
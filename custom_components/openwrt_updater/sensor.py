@@ -0,0 +1,254 @@
+"""OpenWRT sensor entities."""
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+
+from .entity import OpenWRTEntity
+from .helpers.const import DOMAIN, get_device_info, get_fleet_device_info
+from .helpers.summary import FleetSummary
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fleet summary metrics: name, icon and (state, attributes) of a summary
+FLEET_METRICS: dict[
+    str, tuple[str, str, Callable[[FleetSummary], tuple[int, dict[str, Any]]]]
+] = {
+    "online": (
+        "Routers online",
+        "mdi:router-wireless",
+        lambda s: (s.online, {"total": s.total}),
+    ),
+    "outdated": (
+        "Routers outdated",
+        "mdi:update",
+        lambda s: (len(s.outdated), {"devices": sorted(s.outdated)}),
+    ),
+    "versions": (
+        "Firmware versions",
+        "mdi:chart-bar",
+        lambda s: (len(s.versions), {"versions": s.versions}),
+    ),
+    "staged": (
+        "Firmware staged",
+        "mdi:download",
+        lambda s: (len(s.staged), {"devices": sorted(s.staged)}),
+    ),
+}
+
+
+class OpenWRTSensor(OpenWRTEntity, SensorEntity):
+    """Represent an OpenWRT telemetry sensor entity."""
+
+    def __init__(
+        self,
+        coordinator,
+        place_name: str,
+        ip: str,
+        name: str,
+        key: str,
+        device_class: SensorDeviceClass | None = None,
+        unit: str | None = None,
+        suggested_unit: str | None = None,
+        state_class: SensorStateClass | None = SensorStateClass.MEASUREMENT,
+        entity_icon: str | None = None,
+    ) -> None:
+        """Initialize the sensor entity."""
+        super().__init__(coordinator)
+
+        # device properties
+        self._ip = ip
+        self._name = name
+        self._attr_device_info = get_device_info(place_name, ip)
+
+        # base entity properties
+        self._key = key
+        self._snapshot_fields = (key, "status")
+        self._attr_name = f"{name} ({ip})"
+        self._attr_unique_id = f"{name.lower().replace(' ', '_')}_{ip}"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_icon = entity_icon
+
+        # specific entity properties
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_suggested_unit_of_measurement = suggested_unit
+        self._attr_state_class = state_class
+
+        _LOGGER.debug("%r", self)
+
+    @property
+    def native_value(self):
+        """Return the current sensor value."""
+        return self._snapshot_value(self._key)
+
+    @property
+    def available(self):
+        """Return whether the device answered the latest poll."""
+        return self.coordinator.last_update_success and bool(
+            self._snapshot_value("status")
+        )
+
+    def __repr__(self):
+        """Return a debug string representation."""
+        repr_str = f"\nName: {self.name}"
+        repr_str += f"\n\tClass: {self.device_class}"
+        repr_str += f"\n\tCat: {self.entity_category}"
+        return repr_str
+
+
+class OpenWRTFleetSensor(SensorEntity):
+    """Aggregate count over the devices of a place or the whole fleet.
+
+    The state comes from a FleetSummary maintained as deltas; it is only
+    written when this metric changed.
+    """
+
+    _attr_should_poll = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, summary: FleetSummary, key: str, title: str, metric: str
+    ) -> None:
+        """Initialize the sensor for one metric of a summary."""
+        name, icon, self._measure = FLEET_METRICS[metric]
+        self._summary = summary
+        self._attr_device_info = get_fleet_device_info(key, title)
+        self._attr_name = f"{name} ({title})"
+        self._attr_unique_id = f"fleet_{metric}_{key}"
+        self._attr_icon = icon
+        self._attr_native_value, self._attr_extra_state_attributes = self._measure(
+            summary
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Follow summary changes while added."""
+        self._attr_native_value, self._attr_extra_state_attributes = self._measure(
+            self._summary
+        )
+        self.async_on_remove(self._summary.add_listener(self._on_summary_update))
+
+    @callback
+    def _on_summary_update(self) -> None:
+        """Write state if this metric changed."""
+        value, attributes = self._measure(self._summary)
+        if (
+            value == self._attr_native_value
+            and attributes == self._attr_extra_state_attributes
+        ):
+            return
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = attributes
+        self.async_write_ha_state()
+
+
+async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entities):
+    """Set up telemetry and fleet summary sensors for a config entry."""
+    if config_entry.unique_id == "__global__":
+        async_add_entities(
+            OpenWRTFleetSensor(hass.data[DOMAIN]["summary"], "all", "All places", m)
+            for m in FLEET_METRICS
+        )
+        return
+
+    place_name = config_entry.data["place_name"]
+    devices = list(config_entry.options.get("devices", {}).keys())
+
+    summary = hass.data[DOMAIN][config_entry.entry_id]["summary"]
+    entities = [
+        OpenWRTFleetSensor(summary, config_entry.entry_id, place_name, metric)
+        for metric in FLEET_METRICS
+    ]
+    for ip in devices:
+        coordinator = hass.data[DOMAIN][config_entry.entry_id][ip]["coordinator"]
+        entities.extend(
+            [
+                OpenWRTSensor(
+                    coordinator,
+                    place_name,
+                    ip,
+                    "Uptime",
+                    "uptime",
+                    device_class=SensorDeviceClass.DURATION,
+                    unit=UnitOfTime.SECONDS,
+                    suggested_unit=UnitOfTime.DAYS,
+                    state_class=None,
+                ),
+                OpenWRTSensor(
+                    coordinator,
+                    place_name,
+                    ip,
+                    "Load 1m",
+                    "load_1m",
+                    entity_icon="mdi:gauge",
+                ),
+                OpenWRTSensor(
+                    coordinator,
+                    place_name,
+                    ip,
+                    "Load 5m",
+                    "load_5m",
+                    entity_icon="mdi:gauge",
+                ),
+                OpenWRTSensor(
+                    coordinator,
+                    place_name,
+                    ip,
+                    "Load 15m",
+                    "load_15m",
+                    entity_icon="mdi:gauge",
+                ),
+                OpenWRTSensor(
+                    coordinator,
+                    place_name,
+                    ip,
+                    "Free memory",
+                    "memory_available",
+                    device_class=SensorDeviceClass.DATA_SIZE,
+                    unit=UnitOfInformation.KIBIBYTES,
+                    suggested_unit=UnitOfInformation.MEBIBYTES,
+                ),
+                OpenWRTSensor(
+                    coordinator,
+                    place_name,
+                    ip,
+                    "Overlay usage",
+                    "overlay_used_percent",
+                    unit=PERCENTAGE,
+                    entity_icon="mdi:harddisk",
+                ),
+                OpenWRTSensor(
+                    coordinator,
+                    place_name,
+                    ip,
+                    "Tmp usage",
+                    "tmp_used_percent",
+                    unit=PERCENTAGE,
+                    entity_icon="mdi:memory",
+                ),
+                OpenWRTSensor(
+                    coordinator,
+                    place_name,
+                    ip,
+                    "WAN address",
+                    "wan_address",
+                    state_class=None,
+                    entity_icon="mdi:ip-network",
+                ),
+            ]
+        )
+
+    async_add_entities(entities)
@@ -0,0 +1,54 @@
+"""Services of OpenWRT Updater."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.helpers import config_validation as cv
+
+from .helpers.const import DOMAIN
+
+SERVICE_QUERY_PACKAGES = "query_packages"
+
+QUERY_PACKAGES_SCHEMA = vol.Schema(
+    {
+        vol.Required("packages"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("missing", default=False): cv.boolean,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services once."""
+    if hass.services.has_service(DOMAIN, SERVICE_QUERY_PACKAGES):
+        return
+
+    async def _async_query_packages(call: ServiceCall) -> ServiceResponse:
+        """Answer a package query from the fleet inventory, without SSH."""
+        inventory = hass.data[DOMAIN]["inventory"]
+        lookup = (
+            inventory.devices_without
+            if call.data["missing"]
+            else inventory.devices_with
+        )
+        return {
+            "fleet_size": len(inventory.fleet),
+            "firmware_versions": inventory.version_histogram(),
+            "packages": {
+                package: sorted(lookup(package)) for package in call.data["packages"]
+            },
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_PACKAGES,
+        _async_query_packages,
+        schema=QUERY_PACKAGES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -128,4 +128,4 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
             ]
         )
 
-    async_add_entities(entities, update_before_add=True)
+    async_add_entities(entities)
@@ -5,15 +5,15 @@ import logging
 from homeassistant.components.text import TextEntity
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .coordinators.device import OpenWRTDeviceCoordinator
+from .entity import OpenWRTEntity
 from .helpers.const import DOMAIN, get_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class OpenWRTText(CoordinatorEntity, TextEntity):
+class OpenWRTText(OpenWRTEntity, TextEntity):
     """Represent an OpenWRT text entity."""
 
     def __init__(
@@ -40,6 +40,7 @@ class OpenWRTText(CoordinatorEntity, TextEntity):
 
         # base entity properties
         self._key = key
+        self._snapshot_fields = (key,) if key else ()
         self._static_value = static_value
         self._attr_name = f"{name} ({self._ip})"
         self._attr_unique_id = f"{name.lower().replace(' ', '_')}_{self._ip}"
@@ -51,9 +52,7 @@ class OpenWRTText(CoordinatorEntity, TextEntity):
     def native_value(self):
         """Return the current native value."""
         if self._key:
-            self.value = (
-                self.coordinator.data.get(self._key) if self.coordinator.data else None
-            )
+            self.value = self._snapshot_value(self._key)
         else:
             self.value = self._static_value
         return self.value
@@ -99,4 +98,4 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
             ]
         )
 
-    async_add_entities(entities, update_before_add=True)
+    async_add_entities(entities)
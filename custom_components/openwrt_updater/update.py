@@ -9,17 +9,19 @@ from homeassistant.components.update import (
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .entity import OpenWRTEntity
 from .helpers.const import DOMAIN, get_device_info
 from .helpers.updater import OpenWRTUpdater
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class OpenWRTUpdateEntity(CoordinatorEntity, UpdateEntity):
+class OpenWRTUpdateEntity(OpenWRTEntity, UpdateEntity):
     """Represent an OpenWRT firmware update entity."""
 
+    _snapshot_fields = ("current_os_version", "available_os_version", "stale")
+
     def __init__(
         self,
         config_entry,
@@ -51,16 +53,20 @@ class OpenWRTUpdateEntity(CoordinatorEntity, UpdateEntity):
     @property
     def installed_version(self):
         """Return the currently installed version."""
-        if self.coordinator.data is None:
-            return "unavailable"
-        return self.coordinator.data.get("current_os_version")
+        return self._snapshot_value("current_os_version", "unavailable")
 
     @property
     def latest_version(self):
         """Return the latest available version."""
-        if self.coordinator.data is None:
-            return "unavailable"
-        return self.coordinator.data.get("available_os_version")
+        return self._snapshot_value("available_os_version", "unavailable")
+
+    @property
+    def extra_state_attributes(self):
+        """Return static attributes plus whether the data is a persisted snapshot."""
+        return {
+            **self._attr_extra_state_attributes,
+            "stale": self._snapshot_value("stale", False),
+        }
 
     @property
     def available(self):
@@ -96,7 +102,9 @@ class OpenWRTUpdateEntity(CoordinatorEntity, UpdateEntity):
         if not result.get("success", False):
             _LOGGER.error("Update failed for %s: %s", self._ip, result)
             raise HomeAssistantError(str(result.get("message", "")))
-        await self.coordinator.async_request_refresh()
+        if not result.get("flashing"):
+            # Nothing was flashed (download only): show the staged firmware
+            await self.coordinator.async_request_refresh()
         await self.coordinator.async_wait_for_alive()
 
     def __repr__(self):
@@ -123,4 +131,4 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
             ]
         )
 
-    async_add_entities(entities, update_before_add=True)
+    async_add_entities(entities)